@@ -5,6 +5,9 @@ This file contains the main StateGraph that orchestrates
 all the teaching nodes.
 """
 
+import threading
+import warnings
+
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from state import TeachingState
@@ -20,11 +23,16 @@ from nodes.assessment import mcq_generator_node, assessment_node, route_after_as
 # ═══════════════════════════════════════════════════════════════════════════
 # MemorySaver stores checkpoints in memory, keyed by thread_id
 # This allows the graph to resume from where it paused
+# It is created once per process and is already long-lived - there is no
+# per-turn connection to reuse, so compile_graph() takes no checkpointer.
 _checkpointer = MemorySaver()
 
 # Global compiled graph instance - reuse to maintain checkpoint state
 _compiled_graph = None
 
+# Guards the first compile: the frontend calls into the graph from worker threads
+_compile_lock = threading.Lock()
+
 
 def create_teaching_graph() -> StateGraph:
     """
@@ -160,7 +168,7 @@ def create_teaching_graph() -> StateGraph:
     return workflow
 
 
-def compile_graph():
+def compile_graph(workflow=None):
     """
     Compiles the graph for execution WITH checkpointing enabled.
     
@@ -170,16 +178,36 @@ def compile_graph():
     - Resume from where it paused using thread_id
     - Support human-in-the-loop interactions
     
+    Args:
+        workflow: Optional prebuilt StateGraph from create_teaching_graph(),
+            so callers that already built one don't construct it twice.
+            Only applies to the first, compiling call - later calls ignore
+            it with a warning.
+    
     Returns:
         Compiled graph ready to invoke with checkpointing
     """
     global _compiled_graph
     
-    # Only compile once - reuse the same instance to maintain checkpoints
+    # Only compile once - reuse the same instance to maintain checkpoints.
+    # Checked again under the lock so concurrent first calls compile only once;
+    # later calls return without taking the lock.
     if _compiled_graph is None:
-        print("🔧 Compiling graph with checkpointer (first time)")
-        workflow = create_teaching_graph()
-        _compiled_graph = workflow.compile(checkpointer=_checkpointer)
+        with _compile_lock:
+            if _compiled_graph is None:
+                print("🔧 Compiling graph with checkpointer (first time)")
+                if workflow is None:
+                    workflow = create_teaching_graph()
+                _compiled_graph = workflow.compile(checkpointer=_checkpointer)
+                return _compiled_graph
+    
+    # Already compiled - a workflow meant for the first compile can't apply now
+    if workflow is not None:
+        warnings.warn(
+            "compile_graph(workflow=...) ignored: the graph is already compiled",
+            RuntimeWarning,
+            stacklevel=2
+        )
     
     return _compiled_graph
 
@@ -10,6 +10,7 @@ It decides the next action based on current teaching state:
 No LLM required - pure conditional logic based on state tracking.
 """
 
+from collections import namedtuple
 from typing import Dict, Any
 import sys
 from pathlib import Path
@@ -20,6 +21,31 @@ sys.path.append(str(Path(__file__).parent.parent))
 from state import TeachingState
 
 
+# Router-specific slice of TeachingState - the fields the node prints and
+# decides on, read once, plus the derived routing flag
+RouterView = namedtuple("RouterView", "concepts current_index understanding_status all_taught")
+
+# Decision table indexed by RouterView.all_taught: (next_action, reason)
+# Note: Confusion handling is done by feedback_node's teaching loop, so
+# understanding_status does not change the route here.
+_ACTIONS = (
+    ("plan", "Continue with next concept."),
+    ("assess", "All concepts have been taught. Moving to assessment phase."),
+)
+
+
+def _router_view(state: TeachingState) -> RouterView:
+    """Build the router's view of the state once per graph edge."""
+    concepts = state.get("concepts", [])
+    current_index = state.get("current_concept_index", 0)
+    return RouterView(
+        concepts=concepts,
+        current_index=current_index,
+        understanding_status=state.get("understanding_status") or {},
+        all_taught=current_index >= len(concepts),
+    )
+
+
 def router_node(state: TeachingState) -> Dict[str, Any]:
     """
     Routes the teaching workflow based on current state.
@@ -47,9 +73,10 @@ def router_node(state: TeachingState) -> Dict[str, Any]:
     print("="*60)
     
     # Extract relevant state
-    concepts = state.get("concepts", [])
-    current_index = state.get("current_concept_index", 0)
-    understanding_status = state.get("understanding_status", {})
+    view = _router_view(state)
+    concepts = view.concepts
+    current_index = view.current_index
+    understanding_status = view.understanding_status
     
     # Display current state
     print(f"\n📊 Current State:")
@@ -64,29 +91,24 @@ def router_node(state: TeachingState) -> Dict[str, Any]:
         print(f"   Last Interaction: {understanding_status.get('last_interaction_quality', 'N/A')}")
     
     # DECISION LOGIC
-    # Note: Confusion handling is done by feedback_node's teaching loop.
     # Router only decides: continue teaching OR go to assessment.
+    next_action, reason = _ACTIONS[view.all_taught]
     
     # Decision 1: All concepts taught?
-    if current_index >= len(concepts):
-        next_action = "assess"
-        reason = "All concepts have been taught. Moving to assessment phase."
+    if view.all_taught:
         print(f"\n✅ Decision: ASSESS")
         print(f"   Reason: {reason}")
         print(f"   Next: Generate MCQ questions and test student understanding")
     
     # Decision 2: More concepts to teach
     else:
-        next_action = "plan"
-        reason = "Continue with next concept."
         print(f"\n➡️  Decision: PLAN")
         print(f"   Reason: {reason}")
         
         # Show which concept we're about to plan for
-        if current_index < len(concepts):
-            current_concept = concepts[current_index]
-            print(f"   Next Concept: '{current_concept.get('name', 'Unknown')}'")
-            print(f"   Next: Generate lesson plan with takeaways and probing questions")
+        current_concept = concepts[current_index]
+        print(f"   Next Concept: '{current_concept.get('name', 'Unknown')}'")
+        print(f"   Next: Generate lesson plan with takeaways and probing questions")
     
     print("\n" + "="*60)
     print(f"🎯 ROUTING COMPLETE: next_action = '{next_action}'")
@@ -413,7 +413,7 @@ def probing_node(state: TeachingState) -> Dict[str, Any]:
         
     Returns:
         Dict with:
-        - interactions: Updated list with new interaction
+        - interactions: The new interaction (appended by the state reducer)
         - messages: Agent's probing question
         - next_action: "check_understanding"
         
@@ -495,12 +495,9 @@ def probing_node(state: TeachingState) -> Dict[str, Any]:
         student_response=student_response
     )
     
-    # Add to interactions list
-    updated_interactions = interactions + [new_interaction]
-    
     print(f"\n📝 Interaction recorded:")
     print(f"   Timestamp: {new_interaction['timestamp']}")
-    print(f"   Total interactions: {len(updated_interactions)}")
+    print(f"   Total interactions: {len(interactions) + 1}")
     
     print("\n" + "="*60)
     print("🎯 PROBING COMPLETE: Ready to check understanding")
@@ -509,7 +506,7 @@ def probing_node(state: TeachingState) -> Dict[str, Any]:
     
     # Return updated state
     return {
-        "interactions": updated_interactions,
+        "interactions": [new_interaction],  # Reducer appends it to the history
         "next_action": "check_understanding",
         "messages": state.get("messages", []) + [agent_message],
         "student_response": None  # Clear for next interaction
@@ -646,7 +643,8 @@ def understanding_checker_node(state: TeachingState) -> Dict[str, Any]:
     Returns:
         Dict with:
         - understanding_status: Updated understanding classification
-        - interactions: Updated with understanding_status filled in
+        - interactions: Latest interaction with understanding_status filled in
+          (the state reducer replaces the last record with it)
         - next_action: "feedback"
         
     State Fields Used:
@@ -775,8 +773,9 @@ def understanding_checker_node(state: TeachingState) -> Dict[str, Any]:
     }
     
     # Update the latest interaction with understanding status
-    updated_interactions = interactions.copy()
-    updated_interactions[-1] = {
+    # (only the changed record is returned - it keeps the latest id, so the
+    # reducer swaps it in)
+    updated_interaction = {
         **latest_interaction,
         "understanding_status": understanding_status
     }
@@ -796,7 +795,7 @@ def understanding_checker_node(state: TeachingState) -> Dict[str, Any]:
     # Return updated state
     return {
         "understanding_status": understanding_status,
-        "interactions": updated_interactions,
+        "interactions": [updated_interaction],
         "next_action": "feedback",
         "messages": state.get("messages", []) + [
             f"Understanding Checker: Student shows '{classification}' understanding (confidence: {confidence:.0%})"
@@ -5,7 +5,7 @@ This defines the complete state structure that flows between nodes
 in the LangGraph workflow.
 """
 
-from typing import TypedDict, List, Dict, Optional, Literal
+from typing import Annotated, TypedDict, List, Dict, Optional, Literal
 
 
 # Type aliases for better readability
@@ -80,12 +80,49 @@ class ViewConfig(TypedDict):
 
 class Interaction(TypedDict):
     """Record of a student-agent interaction"""
+    id: int  # Turn number (1-based), assigned by merge_interactions
     timestamp: str
     agent_message: str
     student_response: Optional[str]
     understanding_status: Optional[UnderstandingStatus]
 
 
+def merge_interactions(
+    existing: Optional[List[Interaction]],
+    update: Optional[List[Interaction]]
+) -> List[Interaction]:
+    """
+    Reducer for the interactions channel.
+    
+    Nodes return only the records they add or change, not the whole history,
+    so a turn costs O(1) instead of copying every past interaction.
+    A record without an "id" is new: it gets the next turn number and is
+    appended. A record carrying the latest record's id replaces it - e.g. the
+    Understanding Checker filling in understanding_status on a copy of the
+    latest interaction. Records are never matched by content, so an identical
+    question and answer in the same second is still a new turn.
+    
+    Args:
+        existing: Current interaction history
+        update: Records returned by a node (or passed to update_state)
+        
+    Returns:
+        The merged interaction history
+    """
+    merged = list(existing or [])
+    
+    for record in update or []:
+        record_id = record.get("id")
+        if record_id is None:
+            merged.append({**record, "id": len(merged) + 1})
+        elif merged and merged[-1].get("id") == record_id:
+            merged[-1] = record
+        else:
+            merged.append(record)
+    
+    return merged
+
+
 class MCQ(TypedDict):
     """A multiple choice question"""
     id: int
@@ -133,7 +170,7 @@ class TeachingState(TypedDict):
     view_config: ViewConfig
     
     # ===== INTERACTION TRACKING =====
-    interactions: List[Interaction]
+    interactions: Annotated[List[Interaction], merge_interactions]  # Nodes return deltas
     understanding_status: UnderstandingStatus
     
     # ===== ASSESSMENT =====
@@ -0,0 +1,77 @@
+"""
+Test file for the interactions reducer (merge_interactions):
+1. New records are appended with the next turn number as id
+2. A record with the latest id (Understanding Checker) replaces it
+3. An empty update leaves the history unchanged
+"""
+
+from state import merge_interactions
+
+
+def _record(agent_message, student_response, understanding_status=None):
+    """Build an interaction record the way probing/send_message do (no id)."""
+    return {
+        "timestamp": "2024-01-01 10:30:00",
+        "agent_message": agent_message,
+        "student_response": student_response,
+        "understanding_status": understanding_status,
+    }
+
+
+def test_append_assigns_turn_ids():
+    """New records are appended and numbered - even identical ones"""
+    print("\n" + "="*70)
+    print("TEST 1: APPEND (identical question/answer in the same second)")
+    print("="*70)
+    
+    history = merge_interactions([], [_record("What happens?", "It turns red")])
+    history = merge_interactions(history, [_record("What happens?", "It turns red")])
+    
+    assert len(history) == 2, "Identical records should both be kept"
+    assert [r["id"] for r in history] == [1, 2], "Ids should be turn numbers"
+    print(f"\n✅ Test Passed: {len(history)} records, ids {[r['id'] for r in history]}")
+
+
+def test_checker_replaces_latest():
+    """A copy of the latest record (same id) replaces it"""
+    print("\n" + "="*70)
+    print("TEST 2: UNDERSTANDING CHECKER UPDATE")
+    print("="*70)
+    
+    history = merge_interactions([], [_record("Q1", "A1"), _record("Q2", "A2")])
+    checked = {**history[-1], "understanding_status": {"classification": "understood"}}
+    merged = merge_interactions(history, [checked])
+    
+    assert len(merged) == 2, "Update should not add a record"
+    assert merged[-1]["understanding_status"] == {"classification": "understood"}
+    assert merged[0] is history[0], "Earlier records should be untouched"
+    assert history[-1]["understanding_status"] is None, "Input list should not be mutated"
+    print(f"\n✅ Test Passed: latest record updated in place of id {merged[-1]['id']}")
+
+
+def test_empty_update():
+    """An empty or missing update leaves the history as it was"""
+    print("\n" + "="*70)
+    print("TEST 3: EMPTY UPDATE")
+    print("="*70)
+    
+    history = merge_interactions([], [_record("Q1", "A1")])
+    
+    assert merge_interactions(history, []) == history
+    assert merge_interactions(history, None) == history
+    assert merge_interactions(None, None) == []
+    print("\n✅ Test Passed: history unchanged")
+
+
+if __name__ == "__main__":
+    print("\n" + "🧪" * 35)
+    print("TESTING THE INTERACTIONS REDUCER")
+    print("🧪" * 35)
+    
+    test_append_assigns_turn_ids()
+    test_checker_replaces_latest()
+    test_empty_update()
+    
+    print("\n" + "="*70)
+    print("🎉 ALL TESTS PASSED! merge_interactions appends, updates and no-ops correctly.")
+    print("="*70)
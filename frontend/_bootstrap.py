@@ -0,0 +1,25 @@
+"""
+Import Path Setup
+=================
+Adds the project root, backend and frontend directories to sys.path.
+
+Import this module instead of calling sys.path.insert directly. Streamlit
+re-executes app.py on every rerun, but Python runs an imported module only
+once per process, so the paths are added once and never duplicated.
+"""
+
+import sys
+from pathlib import Path
+
+# Project root directory
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Inserted in this order so lookups try frontend, then backend, then root.
+# An entry that is already present (Streamlit adds the script's folder) is
+# moved to the front rather than skipped - both frontend/ and backend/ have a
+# config.py, and frontend's must win.
+for _path in (PROJECT_ROOT, PROJECT_ROOT / "backend", PROJECT_ROOT / "frontend"):
+    _path = str(_path)
+    while _path in sys.path:
+        sys.path.remove(_path)
+    sys.path.insert(0, _path)
@@ -7,14 +7,11 @@ Run with: streamlit run frontend/app.py
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
+import threading
+from collections import deque
 
-# Add project root to path for imports
-PROJECT_ROOT = Path(__file__).parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
-sys.path.insert(0, str(PROJECT_ROOT / "backend"))
-sys.path.insert(0, str(PROJECT_ROOT / "frontend"))
+# Add project root, backend and frontend to path for imports (once per process)
+import _bootstrap
 
 import config
 
@@ -41,10 +38,43 @@ st.set_page_config(
 
 # Start HTTP server for simulations only when running locally
 # On Streamlit Cloud, simulations are served from GitHub Pages
+# NOTE: Streamlit's own static serving (server.enableStaticServing) can't replace
+# this - it sends .html/.js files as text/plain with nosniff, so the iframe
+# would show the simulation's source instead of running it.
 if not config.IS_CLOUD:
     start_simulation_server()
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# BACKEND WARMUP
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _warmup_backend():
+    """Import the backend bridge and compile the graph (runs in a daemon thread)."""
+    try:
+        from utils.backend_bridge import compile_graph
+        compile_graph()
+    except Exception as e:
+        print(f"⚠️ Backend warmup failed (will retry on first use): {e}")
+
+
+@st.cache_resource(show_spinner=False)
+def _start_backend_warmup() -> threading.Thread:
+    """
+    Compile the backend graph in the background, once per process.
+    
+    The first "Start Learning Session" would otherwise pay for importing
+    LangGraph and compiling the graph; this overlaps that with the user
+    filling in the setup form.
+    """
+    thread = threading.Thread(target=_warmup_backend, name="backend-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+_start_backend_warmup()
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # SESSION STATE INITIALIZATION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -89,8 +119,13 @@ def init_session_state():
     if "session_started" not in st.session_state:
         st.session_state.session_started = False
     
+    # Bounded so long sessions don't grow the session snapshot without limit
     if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = deque(maxlen=config.MAX_CHAT_HISTORY)
+    
+    # Running message counts per role, updated wherever chat_history is appended
+    if "chat_counts" not in st.session_state:
+        st.session_state.chat_counts = {"user": 0, "ai": 0}
     
     if "current_simulation_url" not in st.session_state:
         st.session_state.current_simulation_url = None
@@ -98,6 +133,10 @@ def init_session_state():
     if "waiting_for_response" not in st.session_state:
         st.session_state.waiting_for_response = False
     
+    # In-flight backend call (Future), polled by the learning page
+    if "pending_fut" not in st.session_state:
+        st.session_state.pending_fut = None
+    
     if "ready_for_quiz" not in st.session_state:
         st.session_state.ready_for_quiz = False
     
@@ -125,9 +164,12 @@ def reset_session():
     st.session_state.current_page = "setup"
     st.session_state.backend_state = None
     st.session_state.session_started = False
-    st.session_state.chat_history = []
+    st.session_state.chat_history = deque(maxlen=config.MAX_CHAT_HISTORY)
+    st.session_state.chat_counts = {"user": 0, "ai": 0}
+    st.session_state.pop("chat_window", None)
     st.session_state.current_simulation_url = None
     st.session_state.waiting_for_response = False
+    st.session_state.pending_fut = None
     st.session_state.ready_for_quiz = False
     st.session_state.quiz_started = False
     st.session_state.current_mcq_index = 0
@@ -198,6 +240,7 @@ with st.sidebar:
 # Import page modules
 from pages.setup import render_setup_page
 from pages.learning import render_learning_page
+from utils.helpers import flush_notifications
 
 # Route to the correct page based on current_page
 current_page = st.session_state.current_page
@@ -251,3 +294,6 @@ st.markdown(
     "</div>",
     unsafe_allow_html=True
 )
+
+# Show this run's queued success/error/info/warning messages as toasts
+flush_notifications()
@@ -51,6 +51,9 @@ DEFAULT_CONTROL_MODE = "AUTO"
 DEFAULT_LEVEL = "Beginner"
 DEFAULT_CALIBRE = "Medium"
 
+# Maximum chat messages kept in session state (oldest are dropped first)
+MAX_CHAT_HISTORY = 200
+
 # ═══════════════════════════════════════════════════════════════════════════
 # AVAILABLE OPTIONS
 # ═══════════════════════════════════════════════════════════════════════════
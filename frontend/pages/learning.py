@@ -21,28 +21,28 @@ backend/graph.py → All teaching nodes
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
-
-# Add project root to path
-PROJECT_ROOT = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
-sys.path.insert(0, str(PROJECT_ROOT / "backend"))
-sys.path.insert(0, str(PROJECT_ROOT / "frontend"))
-
-# Import bridge and helpers
-from utils.backend_bridge import (
-    initialize_session,
-    send_message,
-    get_progress_info,
-    get_current_concept_info,
-    is_session_complete
-)
+from string import Template
+from typing import Dict, Any, List, Optional, Tuple
+
+# Add project root, backend and frontend to path (frontend first, so the page
+# also works when run on its own)
+FRONTEND_DIR = str(Path(__file__).parent.parent)
+if FRONTEND_DIR not in sys.path:
+    sys.path.insert(0, FRONTEND_DIR)
+import _bootstrap
+
+# Import helpers. The backend bridge (LangGraph, LLM SDKs) is imported inside
+# the functions that use it, so the setup page never pays for loading it.
 from utils.helpers import (
-    display_chat_message,
+    Message,
+    display_chat_history,
     show_loading_message,
     show_error_message,
+    flush_notifications,
     get_timestamp
 )
 import config
@@ -75,11 +75,19 @@ def render_learning_page():
             # Initialization failed, error already shown
             return
     
+    # Snapshot backend state once per run and pass it down, instead of each
+    # section re-reading st.session_state and recomputing progress
+    backend_state = st.session_state.backend_state
+    concepts = backend_state.get("concepts", [])
+    takeaways = backend_state.get("takeaways", [])
+    current_takeaway_idx = backend_state.get("current_takeaway_index", 0)
+    progress, _ = _get_progress_snapshot(backend_state)
+    
     # ───────────────────────────────────────────────────────────────────────
     # STEP 2: Page Header & Navigation
     # ───────────────────────────────────────────────────────────────────────
     
-    _render_header()
+    _render_header(progress)
     
     # ───────────────────────────────────────────────────────────────────────
     # STEP 3: Main Content Area (Split Screen)
@@ -90,7 +98,7 @@ def render_learning_page():
     
     # LEFT SIDE: Simulation Display
     with col_sim:
-        _render_simulation_panel()
+        _render_simulation_panel(takeaways, current_takeaway_idx)
     
     # RIGHT SIDE: Chat Interface
     with col_chat:
@@ -102,48 +110,84 @@ def render_learning_page():
     
     if st.session_state.ready_for_quiz:
         st.markdown("---")
-        _render_completion_section()
+        _render_completion_section(concepts)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # INITIALIZATION
 # ═══════════════════════════════════════════════════════════════════════════
 
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _cached_session_plan(
+    simulation_name: str,
+    level: str,
+    calibre: str,
+    control_mode: str
+) -> Dict[str, Any]:
+    """
+    Run the backend initialization graph once per setup configuration.
+    
+    Repeat launches with the same (simulation, level, calibre, mode) reuse the
+    parsed simulation and concept plan instead of calling the LLM again.
+    The result holds no thread_id - each user gets their own in
+    _initialize_backend().
+    """
+    from utils.backend_bridge import prepare_session
+    
+    return prepare_session(
+        simulation_name=simulation_name,
+        level=level,
+        calibre=calibre,
+        control_mode=control_mode
+    )
+
+
 def _initialize_backend():
     """
     Initialize the backend on first page load.
     
     This function:
-    1. Calls the backend bridge to initialize session
-    2. Runs backend graph: ingest → parse → extract → router → planner → teaching
-    3. Stores backend state in session
+    1. Gets the session plan (cached per setup configuration)
+    2. Runs backend graph on a cache miss: ingest → parse → extract → router → planner → teaching
+    3. Allocates a fresh thread_id and stores backend state in session
     4. Adds first AI message to chat
     5. Sets initial simulation URL
     """
+    from utils.backend_bridge import start_session_thread, get_display_state
     
     st.markdown("### 🔧 Initializing Your Learning Session")
     
     with st.spinner("Analyzing simulation and generating personalized lesson plan..."):
         try:
-            # Call backend bridge
-            result = initialize_session(
+            # Get the session plan (shared across sessions with the same setup)
+            result = _cached_session_plan(
                 simulation_name=st.session_state.selected_simulation,
                 level=st.session_state.selected_level,
                 calibre=st.session_state.selected_calibre,
                 control_mode=st.session_state.selected_mode
             )
             
+            # Every session needs its own checkpoint thread, so this stays uncached
+            thread_id = start_session_thread(result["backend_state"])
+            
             # Store everything in session state (including thread_id for checkpointing!)
-            st.session_state.backend_state = result["backend_state"]
-            st.session_state.thread_id = result["thread_id"]  # CRITICAL: Store for future calls
+            # Only the display slice of the state is kept here - the full state
+            # is in the checkpointer under thread_id
+            st.session_state.backend_state = get_display_state(result["backend_state"])
+            _bump_state_version()
+            st.session_state.thread_id = thread_id  # CRITICAL: Store for future calls
             st.session_state.current_simulation_url = result["simulation_url"]
+            st.session_state.concept_card_templates = [
+                _build_concept_card_template(concept) for concept in result["concepts"]
+            ]
             
             # Add first AI message to chat
-            st.session_state.chat_history.append({
-                "role": "ai",
-                "content": result["first_message"],
-                "timestamp": get_timestamp()
-            })
+            st.session_state.chat_history.append(Message(
+                role="ai",
+                content=result["first_message"],
+                timestamp=get_timestamp()
+            ))
+            st.session_state.chat_counts["ai"] += 1
             
             # Show success and info
             st.success("✅ Session initialized successfully!")
@@ -176,8 +220,13 @@ def _initialize_backend():
 # HEADER SECTION
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _render_header():
-    """Render page header with title and progress."""
+def _render_header(progress: Dict[str, Any]):
+    """
+    Render page header with title and progress.
+    
+    Args:
+        progress: Progress info from get_progress_info()
+    """
     
     # Title row
     col1, col2, col3 = st.columns([4, 3, 1])
@@ -186,18 +235,14 @@ def _render_header():
         st.title(f"📚 Learning: {st.session_state.selected_simulation}")
     
     with col2:
-        # Show progress if backend initialized
-        if st.session_state.backend_state:
-            progress = get_progress_info(st.session_state.backend_state)
-            
-            # Progress indicator
-            st.markdown(
-                f"<div style='text-align: center; padding: 10px;'>"
-                f"<h3 style='margin: 0;'>Concept {progress['current_concept']}/{progress['total_concepts']}</h3>"
-                f"<p style='margin: 0; color: gray;'>{progress['concept_name']}</p>"
-                f"</div>",
-                unsafe_allow_html=True
-            )
+        # Progress indicator
+        st.markdown(
+            f"<div style='text-align: center; padding: 10px;'>"
+            f"<h3 style='margin: 0;'>Concept {progress['current_concept']}/{progress['total_concepts']}</h3>"
+            f"<p style='margin: 0; color: gray;'>{progress['concept_name']}</p>"
+            f"</div>",
+            unsafe_allow_html=True
+        )
     
     with col3:
         # Exit button
@@ -219,13 +264,17 @@ def _render_header():
 # SIMULATION PANEL (LEFT SIDE - 60%)
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _render_simulation_panel():
+def _render_simulation_panel(takeaways: List[Dict[str, Any]], current_takeaway_idx: int):
     """
     Render the simulation display panel.
     
     Shows the HTML simulation in an iframe.
     - AUTO mode: URL includes parameters that update automatically
     - MANUAL mode: Base URL, student controls manually
+    
+    Args:
+        takeaways: Takeaways of the current concept
+        current_takeaway_idx: Index of the takeaway being taught
     """
     
     st.markdown("### 📺 Interactive Simulation")
@@ -243,6 +292,10 @@ def _render_simulation_panel():
         
         # Display simulation in iframe
         # Height: 700px gives good visibility
+        # NOTE: The iframe must be emitted on every full run - Streamlit removes
+        # elements that a run does not re-emit. The browser keeps the loaded page
+        # as long as the src is unchanged, so the simulation reloads only when
+        # its URL actually changes.
         st.components.v1.iframe(
             simulation_url,
             height=700,
@@ -250,13 +303,10 @@ def _render_simulation_panel():
         )
         
         # Show current parameters in AUTO mode (for debugging/transparency)
-        if mode == "AUTO" and st.session_state.backend_state:
+        if mode == "AUTO":
             with st.expander("🔍 Current Parameters (AUTO mode)"):
-                takeaways = st.session_state.backend_state.get("takeaways", [])
-                current_idx = st.session_state.backend_state.get("current_takeaway_index", 0)
-                
-                if 0 <= current_idx < len(takeaways):
-                    params = takeaways[current_idx].get("parameter_values", {})
+                if 0 <= current_takeaway_idx < len(takeaways):
+                    params = takeaways[current_takeaway_idx].get("parameter_values", {})
                     if params:
                         for key, value in params.items():
                             st.text(f"• {key}: {value}")
@@ -270,10 +320,20 @@ def _render_simulation_panel():
 # CHAT PANEL (RIGHT SIDE - 40%)
 # ═══════════════════════════════════════════════════════════════════════════
 
+@st.fragment
 def _render_chat_panel():
     """
     Render the chat interface panel.
     
+    Runs as a fragment, so submitting a message only reruns this panel.
+    Submitting hands off to _handle_user_message(); while the backend call
+    is in flight the panel renders _poll_pending_response(), a timed
+    fragment that applies the reply once it arrives.
+    
+    Progress and the current concept are read here from the versioned
+    progress cache rather than passed in - fragment reruns reuse the
+    arguments of the last full run, which go stale once a reply is applied.
+    
     Features:
     - Scrollable chat history
     - Different styling for AI vs User messages
@@ -282,62 +342,47 @@ def _render_chat_panel():
     - Send button
     """
     
+    progress, current_concept = _get_progress_snapshot(st.session_state.backend_state)
+    
     st.markdown("### 💬 AI Tutor Chat")
     
     # ───────────────────────────────────────────────────────────────────────
     # Current Concept Display (Always visible at top)
     # ───────────────────────────────────────────────────────────────────────
     
-    if st.session_state.backend_state:
-        current_concept = get_current_concept_info(st.session_state.backend_state)
-        progress = get_progress_info(st.session_state.backend_state)
-        
-        if current_concept:
-            concept_name = current_concept.get('name', 'Unknown')
-            concept_desc = current_concept.get('description', '')
-            importance = current_concept.get('importance', 'medium')
-            
-            # Importance badge color
-            importance_color = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(importance, "⚪")
-            
-            # Display concept card
-            st.markdown(
-                f"""
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                            padding: 15px; border-radius: 10px; margin-bottom: 15px; color: white;">
-                    <div style="font-size: 12px; opacity: 0.9;">
-                        📚 Concept {progress['current_concept']} of {progress['total_concepts']} | 
-                        📖 Takeaway {progress['current_takeaway']} of {progress['total_takeaways']}
-                    </div>
-                    <div style="font-size: 18px; font-weight: bold; margin-top: 5px;">
-                        {concept_name} {importance_color}
-                    </div>
-                    <div style="font-size: 13px; opacity: 0.85; margin-top: 5px;">
-                        {concept_desc[:100]}{'...' if len(concept_desc) > 100 else ''}
-                    </div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+    if current_concept:
+        # Static parts of the card were built at init; only fill in the counters
+        card_template = _get_concept_card_template(progress["current_concept"] - 1, current_concept)
+        st.markdown(
+            card_template.substitute(
+                current_concept=progress["current_concept"],
+                total_concepts=progress["total_concepts"],
+                current_takeaway=progress["current_takeaway"],
+                total_takeaways=progress["total_takeaways"]
+            ),
+            unsafe_allow_html=True
+        )
     
     # ───────────────────────────────────────────────────────────────────────
     # Chat History Display
     # ───────────────────────────────────────────────────────────────────────
     
-    # Create a container for chat messages (scrollable)
-    chat_container = st.container()
+    # Single placeholder for the whole chat block, so each run replaces it as
+    # one node. It is created per run on purpose: element handles belong to the
+    # run that created them and can't be kept in session_state for later runs.
+    chat_slot = st.empty()
     
-    with chat_container:
+    with chat_slot.container():
         if st.session_state.chat_history:
-            for msg in st.session_state.chat_history:
-                display_chat_message(
-                    role=msg.get("role", "user"),
-                    content=msg.get("content", ""),
-                    timestamp=msg.get("timestamp")
-                )
+            # Renders only the most recent messages (with a "load earlier" button)
+            display_chat_history(st.session_state.chat_history)
         else:
             st.info("👋 Welcome! The AI tutor will start the conversation once initialized.")
     
+    # Poll for the AI response while a backend call is in flight
+    if st.session_state.get("pending_fut") is not None:
+        _poll_pending_response()
+    
     # ───────────────────────────────────────────────────────────────────────
     # User Input Area
     # ───────────────────────────────────────────────────────────────────────
@@ -357,91 +402,152 @@ def _render_chat_panel():
     
     if user_input:
         _handle_user_message(user_input)
+    
+    # Fragment reruns don't reach app.py's flush, so show queued toasts here
+    flush_notifications()
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # MESSAGE HANDLING
 # ═══════════════════════════════════════════════════════════════════════════
 
+@st.cache_resource
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for backend calls, so they don't block the script."""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="backend")
+
+
+# Seconds between polls of an in-flight backend call
+POLL_INTERVAL = 0.5
+
+
+def _rerun_chat_panel():
+    """
+    Rerun just the chat panel, or the whole app if this is a full run.
+    
+    st.rerun(scope="fragment") raises during a full-app run - which happens
+    when a chat submit is coalesced with a click elsewhere on the page.
+    """
+    ctx = get_script_run_ctx()
+    st.rerun(scope="fragment" if ctx is not None and ctx.fragment_ids_this_run else "app")
+
+
 def _handle_user_message(user_input: str):
     """
     Handle user message submission.
     
     This function:
     1. Adds user message to chat
-    2. Calls backend via bridge
-    3. Backend runs: understanding_checker → feedback → (teaching/probing/router)
-    4. Extracts AI response
-    5. Updates simulation URL (AUTO mode)
-    6. Checks if session complete
-    7. Updates chat with AI response
+    2. Submits the backend call to a worker thread
+    3. Reruns the chat panel so the user's message shows right away
+    
+    The response is picked up by _poll_pending_response() on a later
+    chat panel rerun.
     
     Args:
         user_input: The message user typed
     """
+    from utils.backend_bridge import send_message
     
     # Set waiting state
     st.session_state.waiting_for_response = True
     
     # Add user message to chat immediately
-    st.session_state.chat_history.append({
-        "role": "user",
-        "content": user_input,
-        "timestamp": get_timestamp()
-    })
-    
-    # Show loading indicator
-    with st.spinner("🤔 AI is thinking..."):
-        try:
-            # Call backend bridge with thread_id for checkpointing
-            result = send_message(
-                user_input=user_input,
-                current_backend_state=st.session_state.backend_state,
-                simulation_name=st.session_state.selected_simulation,
-                control_mode=st.session_state.selected_mode,
-                thread_id=st.session_state.thread_id  # Pass thread_id for checkpointing!
-            )
-            
-            # Update session state with results
-            st.session_state.backend_state = result["updated_state"]
-            st.session_state.current_simulation_url = result["simulation_url"]
-            st.session_state.ready_for_quiz = result["ready_for_quiz"]
-            
-            # Add AI response to chat
-            st.session_state.chat_history.append({
-                "role": "ai",
-                "content": result["ai_response"],
-                "timestamp": get_timestamp()
-            })
-            
-            # Reset waiting state
-            st.session_state.waiting_for_response = False
-            
-            # Rerun to update UI
-            st.rerun()
-            
-        except Exception as e:
-            # Handle errors gracefully
-            st.session_state.waiting_for_response = False
-            
-            error_message = f"❌ **Error:** {str(e)}\n\nPlease try again or restart the session."
-            st.session_state.chat_history.append({
-                "role": "ai",
-                "content": error_message,
-                "timestamp": get_timestamp()
-            })
-            
-            show_error_message("Failed to process your message. Please try again.")
-            
-            # Allow user to retry
-            st.rerun()
+    st.session_state.chat_history.append(Message(
+        role="user",
+        content=user_input,
+        timestamp=get_timestamp()
+    ))
+    st.session_state.chat_counts["user"] += 1
+    
+    # Call backend bridge in the background with thread_id for checkpointing
+    # Arguments are read from session_state here, in the script thread -
+    # the worker must not touch st.* (it has no ScriptRunContext)
+    st.session_state.pending_fut = _get_executor().submit(
+        send_message,
+        user_input=user_input,
+        current_backend_state=st.session_state.backend_state,
+        simulation_name=st.session_state.selected_simulation,
+        control_mode=st.session_state.selected_mode,
+        thread_id=st.session_state.thread_id  # Pass thread_id for checkpointing!
+    )
+    
+    # Rerun the chat panel so the message shows and polling starts
+    _rerun_chat_panel()
+
+
+@st.fragment(run_every=POLL_INTERVAL)
+def _poll_pending_response():
+    """
+    Poll the in-flight backend call and apply its result once done.
+    
+    Rendered by the chat panel only while a call is pending, so idle sessions
+    don't poll. Streamlit reruns it on a timer, so no script thread is held
+    between polls.
+    
+    Once the reply is applied the whole app reruns: a nested fragment can't
+    rerun the chat panel around it, and the header, quiz section and (in
+    AUTO mode) simulation URL may have changed too. The iframe keeps its
+    loaded page when its src is unchanged.
+    
+    This function:
+    1. Extracts AI response
+    2. Updates simulation URL (AUTO mode)
+    3. Checks if session complete
+    4. Updates chat with AI response
+    """
+    from utils.backend_bridge import get_display_state
+    
+    future = st.session_state.get("pending_fut")
+    if future is None:
+        return
+    
+    if not future.done():
+        st.caption("🤔 AI is thinking...")
+        return
+    
+    st.session_state.pending_fut = None
+    st.session_state.waiting_for_response = False
+    
+    try:
+        result = future.result()
+        
+        # Update session state with results
+        st.session_state.backend_state = get_display_state(result["updated_state"])
+        _bump_state_version()
+        st.session_state.current_simulation_url = result["simulation_url"]
+        st.session_state.ready_for_quiz = result["ready_for_quiz"]
+        
+        # Add AI response to chat
+        st.session_state.chat_history.append(Message(
+            role="ai",
+            content=result["ai_response"],
+            timestamp=get_timestamp()
+        ))
+        st.session_state.chat_counts["ai"] += 1
+        
+    except Exception as e:
+        # Handle errors gracefully
+        error_message = f"❌ **Error:** {str(e)}\n\nPlease try again or restart the session."
+        st.session_state.chat_history.append(Message(
+            role="ai",
+            content=error_message,
+            timestamp=get_timestamp()
+        ))
+        st.session_state.chat_counts["ai"] += 1
+        
+        show_error_message("Failed to process your message. Please try again.")
+    
+    # Rerun to update UI (chat, header progress, simulation URL, quiz section).
+    # The full run also flushes the error toast queued above.
+    st.rerun()
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # COMPLETION SECTION
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _render_completion_section():
+def _render_completion_section(concepts: List[Dict[str, Any]]):
     """
     Render the completion section when all concepts are taught.
     
@@ -449,18 +555,18 @@ def _render_completion_section():
     - Congratulations message
     - Summary of what was learned
     - "Ready for Quiz" button
+    
+    Args:
+        concepts: All concepts taught in this session
     """
     
     st.success("🎉 **Congratulations!** You've completed all concepts!")
     
     # Show summary
-    if st.session_state.backend_state:
-        concepts = st.session_state.backend_state.get("concepts", [])
-        
-        st.markdown("### 📚 What You Learned:")
-        for i, concept in enumerate(concepts, 1):
-            st.markdown(f"**{i}. {concept.get('name', 'Unknown')}**")
-            st.markdown(f"   _{concept.get('description', 'No description')}_")
+    st.markdown("### 📚 What You Learned:")
+    for i, concept in enumerate(concepts, 1):
+        st.markdown(f"**{i}. {concept.get('name', 'Unknown')}**")
+        st.markdown(f"   _{concept.get('description', 'No description')}_")
     
     st.markdown("---")
     
@@ -483,6 +589,104 @@ def _render_completion_section():
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
+def _build_concept_card_template(concept: Dict[str, Any]) -> Template:
+    """
+    Build the concept card for one concept, leaving the progress counters open.
+    
+    Args:
+        concept: Concept dict with name, description, importance
+        
+    Returns:
+        Template: Substitute current_concept, total_concepts, current_takeaway
+        and total_takeaways to get the card HTML
+    """
+    
+    concept_name = concept.get('name', 'Unknown')
+    concept_desc = concept.get('description', '')
+    importance = concept.get('importance', 'medium')
+    
+    # Importance badge color
+    importance_color = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(importance, "⚪")
+    
+    # Truncate long descriptions
+    concept_desc = concept_desc[:100] + ('...' if len(concept_desc) > 100 else '')
+    
+    # Escape "$" in concept text so Template doesn't treat it as a placeholder
+    concept_name = concept_name.replace("$", "$$")
+    concept_desc = concept_desc.replace("$", "$$")
+    
+    return Template(
+        f"""
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                    padding: 15px; border-radius: 10px; margin-bottom: 15px; color: white;">
+            <div style="font-size: 12px; opacity: 0.9;">
+                📚 Concept $current_concept of $total_concepts | 
+                📖 Takeaway $current_takeaway of $total_takeaways
+            </div>
+            <div style="font-size: 18px; font-weight: bold; margin-top: 5px;">
+                {concept_name} {importance_color}
+            </div>
+            <div style="font-size: 13px; opacity: 0.85; margin-top: 5px;">
+                {concept_desc}
+            </div>
+        </div>
+        """
+    )
+
+
+def _get_concept_card_template(concept_idx: int, concept: Dict[str, Any]) -> Template:
+    """
+    Get the precomputed concept card for a concept, building it if missing.
+    
+    Args:
+        concept_idx: 0-based index of the concept
+        concept: Concept dict (used only if no precomputed card exists)
+        
+    Returns:
+        Template: Concept card template
+    """
+    
+    templates = st.session_state.get("concept_card_templates") or []
+    if 0 <= concept_idx < len(templates):
+        return templates[concept_idx]
+    return _build_concept_card_template(concept)
+
+
+def _bump_state_version():
+    """Mark backend_state as replaced, invalidating values derived from it."""
+    st.session_state.backend_state_version = st.session_state.get("backend_state_version", 0) + 1
+
+
+def _get_progress_snapshot(backend_state: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Get progress and current concept info, memoized per backend_state version.
+    
+    Reruns that don't change backend_state (e.g. navigation, widget clicks)
+    reuse the values computed for the current version.
+    
+    Args:
+        backend_state: Current backend state
+        
+    Returns:
+        tuple: (get_progress_info() result, get_current_concept_info() result)
+    """
+    
+    version = st.session_state.get("backend_state_version", 0)
+    cached = st.session_state.get("_progress_cache")
+    
+    if cached is None or cached[0] != version:
+        from utils.backend_bridge import get_progress_info, get_current_concept_info
+        
+        cached = (
+            version,
+            get_progress_info(backend_state),
+            get_current_concept_info(backend_state)
+        )
+        st.session_state._progress_cache = cached
+    
+    return cached[1], cached[2]
+
+
 def _get_session_stats() -> Dict[str, Any]:
     """
     Get current session statistics.
@@ -492,9 +696,10 @@ def _get_session_stats() -> Dict[str, Any]:
     """
     
     return {
-        "total_messages": len(st.session_state.chat_history),
-        "user_messages": len([m for m in st.session_state.chat_history if m["role"] == "user"]),
-        "ai_messages": len([m for m in st.session_state.chat_history if m["role"] == "ai"]),
+        # chat_history is capped, so count from the running totals
+        "total_messages": sum(st.session_state.chat_counts.values()),
+        "user_messages": st.session_state.chat_counts["user"],
+        "ai_messages": st.session_state.chat_counts["ai"],
         "simulation": st.session_state.selected_simulation,
         "level": st.session_state.selected_level,
         "calibre": st.session_state.selected_calibre,
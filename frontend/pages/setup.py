@@ -11,17 +11,75 @@ Then initializes the backend and navigates to the learning page.
 
 import streamlit as st
 import sys
+from collections import deque
 from pathlib import Path
+from types import MappingProxyType
 
-# Add project root to path for imports
-PROJECT_ROOT = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
-sys.path.insert(0, str(PROJECT_ROOT / "backend"))
-sys.path.insert(0, str(PROJECT_ROOT / "frontend"))
+# Add project root, backend and frontend to path for imports (frontend first,
+# so the page also works when run on its own)
+FRONTEND_DIR = str(Path(__file__).parent.parent)
+if FRONTEND_DIR not in sys.path:
+    sys.path.insert(0, FRONTEND_DIR)
+import _bootstrap
 
 import config
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# DESCRIPTIONS (read-only, built once at import)
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Preview text per simulation
+_SIM_DESCRIPTIONS = MappingProxyType({
+    "Acids and Bases": "🧪 Learn about pH, acids, bases, and chemical indicators through interactive experiments.",
+    "Fractions": "🔢 Understand fractions, numerators, denominators, and fraction visualization.",
+    "STD Simulation": "📊 Explore standard deviation and statistical concepts.",
+    "STD Simulation 1": "📊 Statistical learning simulation (variant 1).",
+    "STD Simulation 2": "📊 Statistical learning simulation (variant 2).",
+    "STD Simulation 3": "📊 Statistical learning simulation (variant 3).",
+    "STD Simulation 4": "📊 Statistical learning simulation (variant 4).",
+})
+
+# What each level means
+_LEVEL_DESCRIPTIONS = MappingProxyType({
+    "Beginner": "📗 Simple explanations, basic concepts, step-by-step guidance",
+    "Intermediate": "📘 Moderate depth, some technical terms, balanced pace",
+    "Advanced": "📕 Complex explanations, advanced concepts, faster pace"
+})
+
+# What each calibre means
+_CALIBRE_DESCRIPTIONS = MappingProxyType({
+    "Dull": "🐢 Slower pace, more repetition, concrete examples",
+    "Medium": "🚶 Balanced speed, standard teaching approach",
+    "High IQ": "🚀 Fast pace, abstract concepts, minimal repetition"
+})
+
+# What each control mode means
+_MODE_DESCRIPTIONS = MappingProxyType({
+    "AUTO": "🤖 **Recommended.** The AI controls the simulation parameters while you observe",
+    "MANUAL": "👐 The AI instructs you and you change the parameters yourself"
+})
+
+
+@st.cache_resource
+def _sim_registry():
+    """
+    Shared, read-only lookup of static per-simulation data.
+    
+    Built once per process and reused by every session and rerun.
+    
+    Returns:
+        dict: {display_name: {"url": base simulation URL, "desc": preview text or None}}
+    """
+    return {
+        name: {
+            "url": config.get_simulation_url(name),
+            "desc": _SIM_DESCRIPTIONS.get(name),
+        }
+        for name in config.SIMULATION_NAMES
+    }
+
+
 def render_setup_page():
     """Render the setup page where users configure their learning session."""
     
@@ -51,162 +109,121 @@ def render_setup_page():
     st.markdown("---")
     
     # ═══════════════════════════════════════════════════════════════════════
-    # STEP 1: SIMULATION SELECTION
-    # ═══════════════════════════════════════════════════════════════════════
-    
-    st.markdown("### 📚 Step 1: Choose Your Simulation")
-    
-    st.markdown("Select an interactive simulation to explore:")
-    
-    selected_simulation = st.selectbox(
-        "Available Simulations:",
-        options=config.SIMULATION_NAMES,
-        index=config.SIMULATION_NAMES.index(st.session_state.selected_simulation) 
-              if st.session_state.selected_simulation in config.SIMULATION_NAMES 
-              else 0,
-        help="Choose a simulation that interests you. The AI will extract key concepts and teach them interactively."
-    )
-    
-    # Show preview/description for selected simulation
-    simulation_descriptions = {
-        "Acids and Bases": "🧪 Learn about pH, acids, bases, and chemical indicators through interactive experiments.",
-        "Fractions": "🔢 Understand fractions, numerators, denominators, and fraction visualization.",
-        "STD Simulation": "📊 Explore standard deviation and statistical concepts.",
-        "STD Simulation 1": "📊 Statistical learning simulation (variant 1).",
-        "STD Simulation 2": "📊 Statistical learning simulation (variant 2).",
-        "STD Simulation 3": "📊 Statistical learning simulation (variant 3).",
-        "STD Simulation 4": "📊 Statistical learning simulation (variant 4).",
-    }
-    
-    if selected_simulation in simulation_descriptions:
-        st.info(f"**Preview:** {simulation_descriptions[selected_simulation]}")
-    
-    st.markdown("---")
-    
-    # ═══════════════════════════════════════════════════════════════════════
-    # STEP 2: STUDENT PROFILE
+    # SETUP FORM
     # ═══════════════════════════════════════════════════════════════════════
     
-    st.markdown("### 👤 Step 2: Tell Us About Yourself")
-    
-    st.markdown("""
-    This helps the AI adapt its teaching to your needs:
-    - **Level** determines the depth and complexity of explanations
-    - **Calibre** affects the pace and style of teaching
-    """)
+    # All inputs live in one form, so changing a selection doesn't rerun the
+    # page - the script only reruns when "Start Learning Session" is clicked.
+    # Descriptions are therefore shown as static option captions/tooltips
+    # rather than blocks that react to the current selection.
     
-    # Create two columns for profile settings
-    col1, col2 = st.columns(2)
+    registry = _sim_registry()
     
-    with col1:
-        st.markdown("**Your Experience Level:**")
-        selected_level = st.radio(
-            "Select your level:",
-            options=config.LEVELS,
-            index=config.LEVELS.index(st.session_state.selected_level),
-            help="Beginner: New to this topic\nIntermediate: Some understanding\nAdvanced: Strong background",
-            label_visibility="collapsed"
+    with st.form("setup_form", border=False):
+        
+        # ═══════════════════════════════════════════════════════════════════
+        # STEP 1: SIMULATION SELECTION
+        # ═══════════════════════════════════════════════════════════════════
+        
+        st.markdown("### 📚 Step 1: Choose Your Simulation")
+        
+        st.markdown("Select an interactive simulation to explore:")
+        
+        # Preview/description for each simulation, shown in the tooltip
+        simulation_previews = "\n".join(
+            f"- **{name}:** {info['desc']}"
+            for name, info in registry.items()
+            if info["desc"]
         )
         
-        # Show what each level means
-        level_descriptions = {
-            "Beginner": "📗 Simple explanations, basic concepts, step-by-step guidance",
-            "Intermediate": "📘 Moderate depth, some technical terms, balanced pace",
-            "Advanced": "📕 Complex explanations, advanced concepts, faster pace"
-        }
-        st.caption(level_descriptions[selected_level])
-    
-    with col2:
-        st.markdown("**Your Learning Pace:**")
-        selected_calibre = st.radio(
-            "Select your learning style:",
-            options=config.CALIBRES,
-            index=config.CALIBRES.index(st.session_state.selected_calibre),
-            help="Dull: Need more time and repetition\nMedium: Average pace\nHigh IQ: Quick learner",
-            label_visibility="collapsed"
+        selected_simulation = st.selectbox(
+            "Available Simulations:",
+            options=config.SIMULATION_NAMES,
+            index=config.SIMULATION_NAMES.index(st.session_state.selected_simulation) 
+                  if st.session_state.selected_simulation in config.SIMULATION_NAMES 
+                  else 0,
+            help="Choose a simulation that interests you. The AI will extract key concepts and teach them interactively.\n\n"
+                 + simulation_previews
         )
         
-        # Show what each calibre means
-        calibre_descriptions = {
-            "Dull": "🐢 Slower pace, more repetition, concrete examples",
-            "Medium": "🚶 Balanced speed, standard teaching approach",
-            "High IQ": "🚀 Fast pace, abstract concepts, minimal repetition"
-        }
-        st.caption(calibre_descriptions[selected_calibre])
-    
-    st.markdown("---")
-    
-    # ═══════════════════════════════════════════════════════════════════════
-    # STEP 3: CONTROL MODE SELECTION
-    # ═══════════════════════════════════════════════════════════════════════
-    
-    st.markdown("### 🎮 Step 3: Choose Control Mode")
-    
-    st.markdown("""
-    How do you want to interact with the simulation?
-    """)
-    
-    selected_mode = st.radio(
-        "Control Mode:",
-        options=config.CONTROL_MODES,
-        index=config.CONTROL_MODES.index(st.session_state.selected_mode),
-        help="AUTO: AI controls the simulation automatically\nMANUAL: You control the simulation yourself",
-        horizontal=True
-    )
-    
-    # Explain the selected mode
-    if selected_mode == "AUTO":
-        st.info("""
-        **🤖 AUTO Mode (Recommended)**
-        - The AI will automatically control the simulation parameters
-        - You focus on learning and observing
-        - The simulation updates automatically to demonstrate concepts
-        - Best for guided learning experience
+        st.markdown("---")
+        
+        # ═══════════════════════════════════════════════════════════════════
+        # STEP 2: STUDENT PROFILE
+        # ═══════════════════════════════════════════════════════════════════
+        
+        st.markdown("### 👤 Step 2: Tell Us About Yourself")
+        
+        st.markdown("""
+        This helps the AI adapt its teaching to your needs:
+        - **Level** determines the depth and complexity of explanations
+        - **Calibre** affects the pace and style of teaching
         """)
-    else:
-        st.info("""
-        **👐 MANUAL Mode**
-        - The AI will instruct you to change parameters
-        - You manually interact with the simulation
-        - More hands-on exploration
-        - Best if you want direct control
+        
+        # Create two columns for profile settings
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**Your Experience Level:**")
+            selected_level = st.radio(
+                "Select your level:",
+                options=config.LEVELS,
+                index=config.LEVELS.index(st.session_state.selected_level),
+                captions=[_LEVEL_DESCRIPTIONS[level] for level in config.LEVELS],
+                help="Beginner: New to this topic\nIntermediate: Some understanding\nAdvanced: Strong background",
+                label_visibility="collapsed"
+            )
+        
+        with col2:
+            st.markdown("**Your Learning Pace:**")
+            selected_calibre = st.radio(
+                "Select your learning style:",
+                options=config.CALIBRES,
+                index=config.CALIBRES.index(st.session_state.selected_calibre),
+                captions=[_CALIBRE_DESCRIPTIONS[calibre] for calibre in config.CALIBRES],
+                help="Dull: Need more time and repetition\nMedium: Average pace\nHigh IQ: Quick learner",
+                label_visibility="collapsed"
+            )
+        
+        st.markdown("---")
+        
+        # ═══════════════════════════════════════════════════════════════════
+        # STEP 3: CONTROL MODE SELECTION
+        # ═══════════════════════════════════════════════════════════════════
+        
+        st.markdown("### 🎮 Step 3: Choose Control Mode")
+        
+        st.markdown("""
+        How do you want to interact with the simulation?
         """)
-    
-    st.markdown("---")
-    
-    # ═══════════════════════════════════════════════════════════════════════
-    # CONFIGURATION SUMMARY
-    # ═══════════════════════════════════════════════════════════════════════
-    
-    st.markdown("### ✅ Your Configuration")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric("📚 Simulation", selected_simulation)
-    with col2:
-        st.metric("👤 Profile", f"{selected_level} • {selected_calibre}")
-    with col3:
-        st.metric("🎮 Mode", selected_mode)
-    
-    st.markdown("---")
-    
-    # ═══════════════════════════════════════════════════════════════════════
-    # START LEARNING BUTTON
-    # ═══════════════════════════════════════════════════════════════════════
-    
-    st.markdown("### 🚀 Ready to Start?")
-    
-    # Center the button
-    col1, col2, col3 = st.columns([1, 2, 1])
-    
-    with col2:
-        start_button = st.button(
-            "🚀 Start Learning Session",
-            type="primary",
-            use_container_width=True,
-            help="Initialize the backend and begin your personalized learning experience"
+        
+        selected_mode = st.radio(
+            "Control Mode:",
+            options=config.CONTROL_MODES,
+            index=config.CONTROL_MODES.index(st.session_state.selected_mode),
+            captions=[_MODE_DESCRIPTIONS[mode] for mode in config.CONTROL_MODES],
+            help="AUTO: AI controls the simulation automatically\nMANUAL: You control the simulation yourself",
+            horizontal=True
         )
+        
+        st.markdown("---")
+        
+        # ═══════════════════════════════════════════════════════════════════
+        # START LEARNING BUTTON
+        # ═══════════════════════════════════════════════════════════════════
+        
+        st.markdown("### 🚀 Ready to Start?")
+        
+        # Center the button
+        col1, col2, col3 = st.columns([1, 2, 1])
+        
+        with col2:
+            start_button = st.form_submit_button(
+                "🚀 Start Learning Session",
+                type="primary",
+                use_container_width=True,
+                help="Initialize the backend and begin your personalized learning experience"
+            )
     
     # ═══════════════════════════════════════════════════════════════════════
     # HANDLE START BUTTON CLICK
@@ -230,8 +247,11 @@ def render_setup_page():
             st.session_state.session_started = True
             
             # Reset any previous session data
-            st.session_state.chat_history = []
+            st.session_state.chat_history = deque(maxlen=config.MAX_CHAT_HISTORY)
+            st.session_state.chat_counts = {"user": 0, "ai": 0}
+            st.session_state.pop("chat_window", None)
             st.session_state.waiting_for_response = False
+            st.session_state.pending_fut = None
             st.session_state.ready_for_quiz = False
             st.session_state.quiz_started = False
             st.session_state.current_mcq_index = 0
@@ -241,7 +261,7 @@ def render_setup_page():
             st.session_state.thread_id = None  # Will be set by initialize_session
             
             # Generate initial simulation URL
-            st.session_state.current_simulation_url = config.get_simulation_url(selected_simulation)
+            st.session_state.current_simulation_url = registry[selected_simulation]["url"]
             
             st.success("✅ Session initialized successfully!")
         
@@ -6,17 +6,133 @@ Serves HTML simulation files so URL parameters work correctly.
 This server runs in a background thread when the Streamlit app starts.
 """
 
+import gzip
+import hashlib
 import http.server
-import socketserver
+import io
+import mimetypes
+import socket
 import threading
 import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
 from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import unquote, urlsplit
 
 from config import SIMULATIONS_DIR, SIMULATION_SERVER_PORT
 
+# Brotli is optional - gzip alone is used when it isn't installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# IN-MEMORY FILE CACHE
+# ═══════════════════════════════════════════════════════════════════════════
+
+# One preloaded static file, ready to be written straight to the socket.
+# compressed maps a Content-Encoding ("br", "gzip") to (data, etag).
+CachedFile = namedtuple("CachedFile", "data etag last_modified content_type compressed")
+
+# Files larger than this aren't held in memory; they're streamed with sendfile
+MAX_CACHED_FILE_SIZE = 1024 * 1024
+
+# Text assets worth pre-compressing (images, fonts etc. are already compressed)
+COMPRESSIBLE_EXTENSIONS = frozenset({".html", ".htm", ".js", ".css", ".svg", ".json", ".txt"})
+
+
+def _compress_variants(data: bytes, etag: str) -> Dict[str, Tuple[bytes, str]]:
+    """
+    Pre-compress a text asset, keeping only encodings that actually shrink it.
+    
+    Each variant gets its own ETag (the identity ETag with an encoding suffix),
+    since the bytes on the wire differ.
+    """
+    variants = {}
+    
+    candidates = [("gzip", lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        candidates.insert(0, ("br", lambda: brotli.compress(data, quality=11)))
+    
+    for encoding, compress in candidates:
+        packed = compress()
+        if len(packed) < len(data):
+            variants[encoding] = (packed, etag[:-1] + "-" + encoding + '"')
+    
+    return variants
+
+
+def build_file_cache(root: Path) -> Tuple[Dict[str, CachedFile], FrozenSet[str]]:
+    """
+    Read every file under root into memory, keyed by URL path.
+    
+    The simulations folder is small and read-only while the app runs, so
+    loading it once at server start avoids a stat/open/read per request.
+    
+    Args:
+        root: Directory to serve (e.g. SIMULATIONS_DIR)
+        
+    Returns:
+        tuple: (URL path (e.g. "/acids bases.html") → CachedFile,
+                URL paths of files too large to cache)
+    """
+    cache = {}
+    large_files = set()
+    pending = [str(root)]
+    
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+                
+                url_path = "/" + Path(entry.path).relative_to(root).as_posix()
+                if entry.stat().st_size > MAX_CACHED_FILE_SIZE:
+                    large_files.add(url_path)
+                    continue
+                
+                with open(entry.path, "rb") as f:
+                    data = f.read()
+                
+                content_type = mimetypes.guess_type(entry.name)[0] or "application/octet-stream"
+                if content_type.startswith("text/"):
+                    content_type += "; charset=utf-8"
+                
+                etag = '"' + hashlib.blake2b(data, digest_size=8).hexdigest() + '"'
+                compressible = os.path.splitext(entry.name)[1].lower() in COMPRESSIBLE_EXTENSIONS
+                
+                cache[url_path] = CachedFile(
+                    data=data,
+                    etag=etag,
+                    last_modified=formatdate(entry.stat().st_mtime, usegmt=True),
+                    content_type=content_type,
+                    compressed=_compress_variants(data, etag) if compressible else {}
+                )
+    
+    return cache, frozenset(large_files)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SERVER
+# ═══════════════════════════════════════════════════════════════════════════
 
 class QuietHandler(http.server.SimpleHTTPRequestHandler):
-    """HTTP handler that suppresses log messages"""
+    """
+    HTTP handler that suppresses log messages.
+    
+    Files preloaded in the server's file_cache are answered straight from
+    memory (with a 304 fast path for revalidation). Files known to be too
+    large to cache fall back to the regular SimpleHTTPRequestHandler
+    behaviour, with bodies sent via sendfile(2) instead of a Python
+    read/write loop. Any other path is a 404 without touching the filesystem.
+    """
     
     def log_message(self, format, *args):
         pass  # Suppress logs
@@ -24,11 +140,167 @@ class QuietHandler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         # Serve files from simulations directory
         super().__init__(*args, directory=str(SIMULATIONS_DIR), **kwargs)
+    
+    def do_GET(self):
+        entry = self._cached_entry()
+        if entry is None:
+            return super().do_GET()
+        body = self._send_cached_headers(entry)
+        if body is not None:
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        entry = self._cached_entry()
+        if entry is None:
+            return super().do_HEAD()
+        self._send_cached_headers(entry)
+    
+    def send_head(self):
+        # Only reached on a cache miss (see do_GET/do_HEAD). The server knows
+        # every file it serves, so skip translate_path/stat for unknown paths.
+        large_files = getattr(self.server, "large_files", None)
+        if large_files is not None and self._request_path() not in large_files:
+            self.send_error(404, "File not found")
+            return None
+        return super().send_head()
+    
+    def list_directory(self, path):
+        # Directory listings aren't part of what the app serves - answer 404
+        # straight away instead of listing and stat-ing every file
+        self.send_error(404, "Not Found")
+        return None
+    
+    def copyfile(self, source, outputfile):
+        # Regular files go kernel → socket without copying through Python.
+        # send_head() has already set Content-Length, so no chunking is needed.
+        if outputfile is self.wfile and isinstance(source, io.BufferedReader):
+            self.wfile.flush()
+            self.connection.sendfile(source)
+            return
+        super().copyfile(source, outputfile)
+    
+    def _request_path(self) -> str:
+        """Request URL path without query, unquoted; directories map to index.html."""
+        path = unquote(urlsplit(self.path).path)
+        if path.endswith("/"):
+            path += "index.html"
+        return path
+    
+    def _cached_entry(self):
+        """Look up the request path in the server's file cache (None on miss)."""
+        file_cache = getattr(self.server, "file_cache", None)
+        if not file_cache:
+            return None
+        return file_cache.get(self._request_path())
+    
+    def _pick_encoding(self, entry: CachedFile) -> Optional[str]:
+        """Pick the best pre-compressed variant the client accepts (br > gzip)."""
+        if not entry.compressed:
+            return None
+        
+        accepted = set()
+        for token in self.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = token.partition(";")
+            params = params.replace(" ", "")
+            try:
+                q = float(params[2:]) if params.startswith("q=") else 1.0
+            except ValueError:
+                q = 0.0
+            if q > 0:
+                accepted.add(name.strip().lower())
+        
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in entry.compressed:
+                return encoding
+        return None
+    
+    def _send_cached_headers(self, entry: CachedFile) -> Optional[bytes]:
+        """
+        Send the response headers for a cached file.
+        
+        Returns:
+            bytes: The body to write, or None for 304 Not Modified
+        """
+        encoding = self._pick_encoding(entry)
+        if encoding is None:
+            data, etag = entry.data, entry.etag
+        else:
+            data, etag = entry.compressed[encoding]
+        
+        if_none_match = self.headers.get("If-None-Match")
+        if (if_none_match == etag or
+                (if_none_match is None and
+                 self.headers.get("If-Modified-Since") == entry.last_modified)):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            if entry.compressed:
+                self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return None
+        
+        self.send_response(200)
+        self.send_header("Content-Type", entry.content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        if entry.compressed:
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", entry.last_modified)
+        # Revalidate every load: filenames aren't content-hashed, so an
+        # "immutable" copy would hide edits; the ETag makes the check a 304
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        return data
+
+
+class SimulationHTTPServer(http.server.ThreadingHTTPServer):
+    """
+    Threaded HTTP server with Nagle's algorithm disabled on client sockets.
+    
+    A simulation page pulls many small HTML/JS/CSS files. With Nagle on, each
+    response can stall ~40ms waiting on a delayed ACK; TCP_NODELAY sends it
+    right away.
+    
+    Requests are handled by a fixed pool of worker threads (created once at
+    server start) rather than a new thread per request, so the browser's
+    parallel asset fetches run concurrently without unbounded thread growth.
+    """
+    
+    allow_reuse_address = True
+    daemon_threads = True
+    max_workers = 8
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.file_cache, self.large_files = build_file_cache(SIMULATIONS_DIR)
+        self.pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="sim-server"
+        )
+    
+    def get_request(self):
+        conn, addr = super().get_request()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn, addr
+    
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+    
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False)
+
+
+# Set once this process has started (or found) the server. Streamlit reruns
+# app.py on every interaction, so later calls return without probing the port.
+# Cleared again if the server fails to start, so the next rerun retries.
+_server_started = False
+_server_lock = threading.Lock()
 
 
 def is_server_running(port: int) -> bool:
     """Check if server is already running on the port"""
-    import socket
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         return s.connect_ex(('localhost', port)) == 0
 
@@ -39,16 +311,29 @@ def start_simulation_server():
     
     The server serves HTML files from SimulationsNCERT-main/ folder.
     This allows URL parameters to work (file:// URLs strip them).
+    
+    Safe to call on every Streamlit rerun: after the first call it returns
+    immediately, without a syscall.
     """
+    global _server_started
     
-    # Check if already running
-    if is_server_running(SIMULATION_SERVER_PORT):
-        print(f"✅ Simulation server already running on port {SIMULATION_SERVER_PORT}")
+    if _server_started:
         return
     
+    with _server_lock:
+        if _server_started:
+            return
+        _server_started = True
+        
+        # Check if already running (e.g. started by another process)
+        if is_server_running(SIMULATION_SERVER_PORT):
+            print(f"✅ Simulation server already running on port {SIMULATION_SERVER_PORT}")
+            return
+    
     def run_server():
+        global _server_started
         try:
-            with socketserver.TCPServer(("", SIMULATION_SERVER_PORT), QuietHandler) as httpd:
+            with SimulationHTTPServer(("", SIMULATION_SERVER_PORT), QuietHandler) as httpd:
                 print(f"✅ Simulation server started on http://localhost:{SIMULATION_SERVER_PORT}")
                 httpd.serve_forever()
         except OSError as e:
@@ -56,6 +341,9 @@ def start_simulation_server():
                 print(f"✅ Simulation server already running on port {SIMULATION_SERVER_PORT}")
             else:
                 print(f"❌ Server error: {e}")
+                # Let a later rerun try again instead of assuming it's running
+                with _server_lock:
+                    _server_started = False
     
     # Start server in daemon thread (will stop when main app stops)
     server_thread = threading.Thread(target=run_server, daemon=True)
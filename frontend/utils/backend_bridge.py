@@ -13,8 +13,12 @@ Each session gets a unique thread_id that allows the graph to resume from
 where it paused (e.g., after teaching node, waiting for user input).
 """
 
+import logging
+import secrets
 import sys
-import uuid
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 
@@ -24,6 +28,10 @@ sys.path.insert(0, str(PROJECT_ROOT))
 sys.path.insert(0, str(PROJECT_ROOT / "backend"))
 
 # Import backend modules
+# compile_graph() is a process-wide singleton (warmed up by app.py), so every
+# session already shares one compiled graph. Don't wrap it in a per-simulation
+# st.cache_resource: separate graphs would each get their own checkpointer and
+# lose the thread_id state the bridge resumes from.
 from backend.graph import compile_graph
 from backend.state import TeachingState
 import backend.config as backend_config
@@ -42,6 +50,41 @@ spec = importlib.util.spec_from_file_location(
 frontend_config = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(frontend_config)
 
+# Per-turn tracing goes to DEBUG so the request path doesn't write to stdout.
+# Enable with logging.getLogger("utils.backend_bridge").setLevel(logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+# Backend state fields the frontend reads (progress, concept card, AUTO params,
+# validation). Everything else is read from the checkpointer when needed.
+DISPLAY_STATE_FIELDS = (
+    "simulation_name",
+    "concepts",
+    "current_concept_index",
+    "takeaways",
+    "current_takeaway_index",
+    "next_action",
+    "understanding_status",
+)
+
+# The state fields the response helpers read, resolved once per graph result
+# (see _view) instead of re-fetched from the dict by every helper
+StateView = namedtuple(
+    "StateView",
+    "messages concepts takeaways current_concept_index current_takeaway_index feedback"
+)
+
+# Fields validate_backend_state requires (tuple keeps the error message order,
+# the frozenset makes the common all-present case a single subset test)
+REQUIRED_STATE_FIELDS = (
+    "simulation_name",
+    "concepts",
+    "current_concept_index",
+    "takeaways",
+    "next_action",
+)
+_REQUIRED_STATE_FIELD_SET = frozenset(REQUIRED_STATE_FIELDS)
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # THREAD ID MANAGEMENT - For checkpointing
@@ -52,7 +95,7 @@ def generate_thread_id() -> str:
     Generate a unique thread_id for a new learning session.
     This ID is used by the checkpointer to save and restore graph state.
     """
-    return f"session_{uuid.uuid4().hex[:12]}"
+    return f"session_{secrets.token_hex(6)}"
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -107,57 +150,77 @@ def initialize_session(
         thread_id = generate_thread_id()
         print(f"🆔 Generated thread_id: {thread_id}")
         
-        # Step 2: Convert display name to backend key
-        backend_key = frontend_config.get_backend_key(simulation_name)
-        
-        # Step 3: Create initial state for backend
-        initial_state: TeachingState = {
-            "simulation_name": backend_key,  # e.g., "acids_bases"
-            "learner_profile": {
-                "level": level,
-                "calibre": calibre
-            }
-        }
-        
-        # Step 4: Compile and invoke the backend graph WITH checkpointing
-        # The config includes thread_id for state persistence
-        # Graph will run: ingest → parse → extract → router → planner → teaching
-        # Then pause at teaching node (wait_for_start) and save state
-        compiled_graph = compile_graph()
-        config = {
-            "configurable": {"thread_id": thread_id},
-            "recursion_limit": 25  # Allow enough steps for initialization
-        }
-        result_state = compiled_graph.invoke(initial_state, config)
-        
-        print(f"✅ Graph paused at: next_action = {result_state.get('next_action')}")
-        
-        # Step 5: Extract first teaching message
-        first_message = _extract_first_message(result_state)
-        
-        # Step 6: Generate initial simulation URL
-        simulation_url = _generate_simulation_url(
-            simulation_name,
-            result_state,
-            control_mode
-        )
+        # Steps 2-7: Run the graph on this thread and build the session plan
+        session_plan = _run_initial_graph(simulation_name, level, calibre, control_mode, thread_id)
         
-        # Step 7: Return everything frontend needs (including thread_id!)
+        # Return everything frontend needs (including thread_id!)
         return {
-            "backend_state": result_state,
+            **session_plan,
             "thread_id": thread_id,  # IMPORTANT: Frontend must store this for future calls
-            "first_message": first_message,
-            "simulation_url": simulation_url,
-            "concepts": result_state.get("concepts", []),
-            "total_concepts": len(result_state.get("concepts", [])),
-            "current_concept_index": result_state.get("current_concept_index", 0),
-            "mode": control_mode
         }
         
     except Exception as e:
         raise Exception(f"Failed to initialize session: {str(e)}")
 
 
+def prepare_session(
+    simulation_name: str,
+    level: str,
+    calibre: str,
+    control_mode: str
+) -> Dict[str, Any]:
+    """
+    Build a session plan that is not tied to any user's thread.
+    
+    Same as initialize_session() but without "thread_id" in the result, so
+    the plan only depends on the setup selections and can be cached and
+    shared between users. Call start_session_thread() to get a thread_id
+    for each user before sending messages.
+    
+    Args:
+        simulation_name: Display name like "Acids and Bases"
+        level: "Beginner", "Intermediate", or "Advanced"
+        calibre: "Dull", "Medium", or "High IQ"
+        control_mode: "AUTO" or "MANUAL"
+        
+    Returns:
+        dict: Same as initialize_session() minus "thread_id"
+        
+    Raises:
+        Exception: If backend initialization fails
+    """
+    
+    try:
+        return _run_initial_graph(simulation_name, level, calibre, control_mode, generate_thread_id())
+    except Exception as e:
+        raise Exception(f"Failed to initialize session: {str(e)}")
+
+
+def start_session_thread(backend_state: Dict[str, Any]) -> str:
+    """
+    Allocate a fresh thread_id and seed its checkpoint with a prepared state.
+    
+    The state is written as if the probing node produced it, which is where
+    the initial graph run pauses. send_message() can then resume this thread
+    exactly like one created by initialize_session().
+    
+    Args:
+        backend_state: "backend_state" from prepare_session()
+        
+    Returns:
+        str: New thread_id for this user's session
+    """
+    
+    thread_id = generate_thread_id()
+    print(f"🆔 Generated thread_id: {thread_id}")
+    
+    compiled_graph = compile_graph()
+    config = {"configurable": {"thread_id": thread_id}}
+    compiled_graph.update_state(config, backend_state, as_node="probing")
+    
+    return thread_id
+
+
 def send_message(
     user_input: str,
     current_backend_state: Dict[str, Any],
@@ -203,50 +266,55 @@ def send_message(
     """
     
     try:
-        print(f"\n📤 send_message called with thread_id: {thread_id}")
-        print(f"   User input: {user_input[:50]}...")
+        logger.debug("📤 send_message called with thread_id: %s", thread_id)
+        logger.debug("   User input: %.50s...", user_input)
         
         # Step 1: Get the compiled graph (singleton)
         compiled_graph = compile_graph()
         config = {"configurable": {"thread_id": thread_id}}
         
         # Step 2: Get current checkpoint state to understand where we are
-        current_state = compiled_graph.get_state(config)
-        current_values = current_state.values
-        print(f"📍 Current checkpoint state:")
-        print(f"   next_action: {current_values.get('next_action')}")
-        print(f"   current_takeaway_index: {current_values.get('current_takeaway_index')}")
-        print(f"   interactions count: {len(current_values.get('interactions', []))}")
-        print(f"   messages count: {len(current_values.get('messages', []))}")
+        # (the checkpoint, not the caller's copy, holds the question to record)
+        current_values = compiled_graph.get_state(config).values
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "📍 Current checkpoint state: next_action=%s, current_takeaway_index=%s, "
+                "interactions=%d, messages=%d",
+                current_values.get("next_action"),
+                current_values.get("current_takeaway_index"),
+                len(current_values.get("interactions", [])),
+                len(current_values.get("messages", []))
+            )
         
         # Step 3: Create the interaction record for this Q&A pair
         # The probing node added the question to messages but didn't create an interaction
         # (because it was waiting for student response)
         # Now we create the complete interaction
-        import datetime
         messages = current_values.get("messages", [])
         agent_message = messages[-1] if messages else "Question asked"
         
         new_interaction = {
-            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "agent_message": agent_message,
             "student_response": user_input,
             "understanding_status": None  # Will be filled by understanding_checker
         }
         
-        interactions = list(current_values.get("interactions", []))
-        interactions.append(new_interaction)
-        print(f"✅ Created interaction record (total: {len(interactions)})")
+        # Only the new record is sent - the interactions reducer appends it
+        logger.debug("✅ Created interaction record")
         
         # Step 4: Update the state with student's response AND change next_action
         # The key insight: probing node ended with next_action="wait_for_response"
         # We need to change it to "check_understanding" so conditional edge routes correctly
-        print(f"🔄 Updating state with student_response, interactions, and next_action...")
+        # NOTE: This can't be folded into invoke(input) - a non-None input starts a
+        # new run at the entry point (ingest), re-running ingestion and planning.
+        # Patching as "probing" and resuming with invoke(None) continues mid-graph.
+        logger.debug("🔄 Updating state with student_response, interactions, and next_action...")
         compiled_graph.update_state(
             config,
             {
                 "student_response": user_input,
-                "interactions": interactions,  # With new interaction record
+                "interactions": [new_interaction],  # Appended by the state reducer
                 "next_action": "check_understanding"  # This routes to understanding_checker
             },
             as_node="probing"  # Update as if coming from probing node
@@ -255,19 +323,20 @@ def send_message(
         # Step 5: Resume the graph from the checkpoint
         # With next_action="check_understanding", the conditional edge after probing
         # will route to understanding_checker node
-        print(f"▶️  Resuming graph execution...")
+        logger.debug("▶️  Resuming graph execution...")
         result_state = compiled_graph.invoke(None, {**config, "recursion_limit": 25})
         
-        print(f"✅ Graph completed. next_action = {result_state.get('next_action')}")
+        logger.debug("✅ Graph completed. next_action = %s", result_state.get("next_action"))
         
         # Step 3: Determine what happened and extract AI response
         next_action = result_state.get("next_action", "teach")
-        ai_response = _extract_ai_response(result_state, next_action)
+        view = _view(result_state)
+        ai_response = _extract_ai_response(view, next_action)
         
         # Step 4: Generate updated simulation URL
         simulation_url = _generate_simulation_url(
             simulation_name,
-            result_state,
+            view,
             control_mode
         )
         
@@ -373,11 +442,134 @@ def is_session_complete(backend_state: Dict[str, Any]) -> bool:
     return _is_session_complete(backend_state)
 
 
+def get_display_state(backend_state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the slice of backend state the frontend needs for display.
+    
+    The full state (messages, interactions, simulation params, ...) grows
+    with the session and already lives in the checkpointer under the
+    session's thread_id, so the frontend only keeps this slice around.
+    
+    Args:
+        backend_state: Full backend state
+        
+    Returns:
+        dict: Shallow copy of DISPLAY_STATE_FIELDS present in backend_state
+    """
+    return {
+        field: backend_state[field]
+        for field in DISPLAY_STATE_FIELDS
+        if field in backend_state
+    }
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS (Internal Use Only)
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _extract_first_message(backend_state: Dict[str, Any]) -> str:
+def _run_initial_graph(
+    simulation_name: str,
+    level: str,
+    calibre: str,
+    control_mode: str,
+    thread_id: str
+) -> Dict[str, Any]:
+    """
+    Run the initialization graph on a thread and build the session plan.
+    
+    Args:
+        simulation_name: Display name like "Acids and Bases"
+        level: "Beginner", "Intermediate", or "Advanced"
+        calibre: "Dull", "Medium", or "High IQ"
+        control_mode: "AUTO" or "MANUAL"
+        thread_id: Thread to checkpoint the run under
+        
+    Returns:
+        dict: Session plan (everything initialize_session returns except thread_id)
+    """
+    
+    # Convert display name to backend key
+    backend_key = frontend_config.get_backend_key(simulation_name)
+    
+    # Create initial state for backend
+    initial_state: TeachingState = {
+        "simulation_name": backend_key,  # e.g., "acids_bases"
+        "learner_profile": {
+            "level": level,
+            "calibre": calibre
+        }
+    }
+    
+    # Compile and invoke the backend graph WITH checkpointing
+    # The config includes thread_id for state persistence
+    # Graph will run: ingest → parse → extract → router → planner → teaching
+    # Then pause at teaching node (wait_for_start) and save state
+    compiled_graph = compile_graph()
+    config = {
+        "configurable": {"thread_id": thread_id},
+        "recursion_limit": 25  # Allow enough steps for initialization
+    }
+    result_state = compiled_graph.invoke(initial_state, config)
+    
+    print(f"✅ Graph paused at: next_action = {result_state.get('next_action')}")
+    
+    # Extract first teaching message
+    view = _view(result_state)
+    first_message = _extract_first_message(view)
+    
+    # Generate initial simulation URL
+    simulation_url = _generate_simulation_url(
+        simulation_name,
+        view,
+        control_mode
+    )
+    
+    return {
+        "backend_state": result_state,
+        "first_message": first_message,
+        "simulation_url": simulation_url,
+        "concepts": result_state.get("concepts", []),
+        "total_concepts": len(result_state.get("concepts", [])),
+        "current_concept_index": result_state.get("current_concept_index", 0),
+        "mode": control_mode
+    }
+
+
+def _view(backend_state: Dict[str, Any]) -> StateView:
+    """
+    Resolve the fields the response helpers read, once per graph result.
+    
+    Args:
+        backend_state: State returned from a graph invocation
+        
+    Returns:
+        StateView: messages, concepts, takeaways, indices and feedback
+    """
+    return StateView(
+        messages=backend_state.get("messages", []),
+        concepts=backend_state.get("concepts", []),
+        takeaways=backend_state.get("takeaways", []),
+        current_concept_index=backend_state.get("current_concept_index", 0),
+        current_takeaway_index=backend_state.get("current_takeaway_index", 0),
+        feedback=backend_state.get("feedback", "")
+    )
+
+
+def _format_recent_messages(messages: List[str], n: int = 2) -> Optional[str]:
+    """
+    Join the last n non-empty messages with a horizontal rule.
+    
+    Args:
+        messages: Backend message list
+        n: How many trailing messages to include
+        
+    Returns:
+        str: The formatted messages, or None if there are none to show
+    """
+    return "\n\n---\n\n".join(msg for msg in messages[-n:] if msg and msg.strip()) or None
+
+
+def _extract_first_message(view: StateView) -> str:
     """
     Extract the first teaching message from backend state.
     
@@ -388,24 +580,21 @@ def _extract_first_message(backend_state: Dict[str, Any]) -> str:
     - Created first probing question
     
     Args:
-        backend_state: State returned from initial graph invocation
+        view: _view() of the state returned from initial graph invocation
         
     Returns:
         str: First message to show to user (explanation + question)
     """
     
     # Check if we have messages in state (teaching node adds them)
-    messages = backend_state.get("messages", [])
-    if messages:
-        # Return the last 2 messages (teaching explanation + probing question)
-        recent_messages = messages[-2:] if len(messages) >= 2 else messages
-        formatted_parts = [msg for msg in recent_messages if msg.strip()]
-        if formatted_parts:
-            return "\n\n---\n\n".join(formatted_parts)
+    # The last 2 messages are the teaching explanation + probing question
+    recent = _format_recent_messages(view.messages)
+    if recent:
+        return recent
     
     # Fallback: Try to get from takeaways
-    takeaways = backend_state.get("takeaways", [])
-    concepts = backend_state.get("concepts", [])
+    takeaways = view.takeaways
+    concepts = view.concepts
     
     if takeaways and len(takeaways) > 0:
         first_takeaway = takeaways[0]
@@ -421,7 +610,7 @@ def _extract_first_message(backend_state: Dict[str, Any]) -> str:
             if concept_name:
                 msg_parts.append(f"**📚 Concept: {concept_name}**")
         
-        msg_parts.append("**📖 Takeaway 1 of " + str(len(takeaways)) + "**")
+        msg_parts.append(f"**📖 Takeaway 1 of {len(takeaways)}**")
         
         if explanation:
             msg_parts.append(explanation)
@@ -443,7 +632,7 @@ def _extract_first_message(backend_state: Dict[str, Any]) -> str:
     return "Welcome! Let's start exploring this simulation together."
 
 
-def _extract_ai_response(backend_state: Dict[str, Any], next_action: str) -> str:
+def _extract_ai_response(view: StateView, next_action: str) -> str:
     """
     Extract AI's response based on what action the backend took.
     
@@ -454,18 +643,18 @@ def _extract_ai_response(backend_state: Dict[str, Any], next_action: str) -> str
     We need to return the NEW messages that were added in this cycle.
     
     Args:
-        backend_state: Current backend state
+        view: _view() of the current backend state
         next_action: "teach", "probe", "assess", "re-explain", "wait_for_start", or "wait_for_response"
         
     Returns:
         str: AI's message to display
     """
     
-    messages = backend_state.get("messages", [])
-    takeaways = backend_state.get("takeaways", [])
-    current_takeaway_idx = backend_state.get("current_takeaway_index", 0)
-    concepts = backend_state.get("concepts", [])
-    current_concept_idx = backend_state.get("current_concept_index", 0)
+    messages = view.messages
+    takeaways = view.takeaways
+    current_takeaway_idx = view.current_takeaway_index
+    concepts = view.concepts
+    current_concept_idx = view.current_concept_index
     
     # Get current concept name for context
     concept_name = ""
@@ -479,18 +668,9 @@ def _extract_ai_response(backend_state: Dict[str, Any], next_action: str) -> str
     
     # If we have messages, return the most recent ones
     # After a teaching cycle, the last 2 messages are: [teaching explanation, probing question]
-    if messages:
-        # Get the last 2 messages (teaching + probing)
-        recent_messages = messages[-2:] if len(messages) >= 2 else messages
-        
-        # Format them nicely
-        formatted_parts = []
-        for msg in recent_messages:
-            if msg.strip():
-                formatted_parts.append(msg)
-        
-        if formatted_parts:
-            return "\n\n---\n\n".join(formatted_parts)
+    recent = _format_recent_messages(messages)
+    if recent:
+        return recent
     
     # Fallback based on next_action
     if next_action in ["wait_for_start", "wait_for_response"]:
@@ -539,7 +719,7 @@ def _extract_ai_response(backend_state: Dict[str, Any], next_action: str) -> str
     
     elif next_action == "re-explain":
         # Backend detected confusion, providing feedback
-        feedback = backend_state.get("feedback", "")
+        feedback = view.feedback
         if feedback:
             return feedback
         else:
@@ -551,7 +731,7 @@ def _extract_ai_response(backend_state: Dict[str, Any], next_action: str) -> str
 
 def _generate_simulation_url(
     simulation_name: str,
-    backend_state: Dict[str, Any],
+    view: StateView,
     control_mode: str
 ) -> str:
     """
@@ -559,7 +739,7 @@ def _generate_simulation_url(
     
     Args:
         simulation_name: Display name of simulation
-        backend_state: Current backend state
+        view: _view() of the current backend state
         control_mode: "AUTO" or "MANUAL"
         
     Returns:
@@ -568,8 +748,8 @@ def _generate_simulation_url(
     
     if control_mode == "AUTO":
         # In AUTO mode, extract parameter values from current takeaway
-        takeaways = backend_state.get("takeaways", [])
-        current_takeaway_idx = backend_state.get("current_takeaway_index", 0)
+        takeaways = view.takeaways
+        current_takeaway_idx = view.current_takeaway_index
         
         # Get parameter values if available
         params = {}
@@ -578,18 +758,35 @@ def _generate_simulation_url(
             params = current_takeaway.get("parameter_values", {})
             
             # Debug: Log what parameters we're using
-            print(f"🔧 AUTO Mode URL Generation:")
-            print(f"   Takeaway {current_takeaway_idx + 1}: {current_takeaway.get('explanation', '')[:50]}...")
-            print(f"   Parameters: {params}")
-        
-        # Generate URL with parameters
-        url = frontend_config.get_simulation_url(simulation_name, params)
-        print(f"   Generated URL: {url}")
+            logger.debug(
+                "🔧 AUTO Mode URL Generation: takeaway %d, parameters %s",
+                current_takeaway_idx + 1, params
+            )
+        
+        # Generate URL with parameters (memoized - a takeaway usually spans
+        # several turns with the same parameter values)
+        try:
+            url = _cached_simulation_url(simulation_name, tuple(sorted(params.items())))
+        except TypeError:
+            # Unhashable parameter values (e.g. lists) - build it directly
+            url = frontend_config.get_simulation_url(simulation_name, params)
+        logger.debug("   Generated URL: %s", url)
         return url
     
     else:
         # In MANUAL mode, just show base simulation URL
-        return frontend_config.get_simulation_url(simulation_name)
+        return _cached_simulation_url(simulation_name, ())
+
+
+@lru_cache(maxsize=256)
+def _cached_simulation_url(simulation_name: str, params_key: Tuple) -> str:
+    """
+    Memoized get_simulation_url keyed by (simulation, sorted param items).
+    
+    Also returns the identical string object for repeat URLs, so the iframe
+    source is unchanged between turns that don't move the simulation.
+    """
+    return frontend_config.get_simulation_url(simulation_name, dict(params_key))
 
 
 def _is_session_complete(backend_state: Dict[str, Any]) -> bool:
@@ -649,17 +846,9 @@ def validate_backend_state(backend_state: Dict[str, Any]) -> Tuple[bool, str]:
         tuple: (is_valid, error_message)
     """
     
-    required_fields = [
-        "simulation_name",
-        "concepts",
-        "current_concept_index",
-        "takeaways",
-        "next_action"
-    ]
-    
-    for field in required_fields:
-        if field not in backend_state:
-            return False, f"Missing required field: {field}"
+    if not backend_state.keys() >= _REQUIRED_STATE_FIELD_SET:
+        missing = next(f for f in REQUIRED_STATE_FIELDS if f not in backend_state)
+        return False, f"Missing required field: {missing}"
     
     # Check that concepts is a list
     if not isinstance(backend_state.get("concepts"), list):
@@ -5,8 +5,31 @@ Common UI components and utilities for the frontend.
 """
 
 import streamlit as st
-from datetime import datetime
-from typing import List, Dict, Any
+import time
+from collections import namedtuple
+from itertools import islice
+from typing import Iterable, List
+
+# How many chat messages are rendered by default, and how many more each
+# "Load earlier messages" click reveals
+CHAT_WINDOW_STEP = 50
+
+# Only the newest messages get individual chat bubbles; older ones in the
+# window are rendered together as one markdown block
+CHAT_BUBBLE_TAIL = 20
+
+_ROLE_LABELS = {"ai": "🤖 AI", "user": "👤 You"}
+
+# One chat_history entry; a tuple, so rendering uses attribute access rather
+# than a dict lookup with a default per field
+Message = namedtuple("Message", "role content timestamp")
+
+# Chat role → (st.chat_message name, avatar); unknown roles render as user
+_ROLE_CFG = {"ai": ("assistant", "🤖"), "user": ("user", "👤")}
+
+# Last formatted timestamp, keyed by whole second ("t") - the minute-precision
+# string can't change within the same second
+_last_ts_cache = {"t": -1, "s": ""}
 
 
 def display_chat_message(role: str, content: str, timestamp: str = None):
@@ -17,51 +40,116 @@ def display_chat_message(role: str, content: str, timestamp: str = None):
         role: "ai" or "user"
         content: Message text
         timestamp: Optional timestamp string
+    
+    NOTE: st.markdown only ships the raw string - the markdown is parsed in
+    the browser, so pre-rendering it to HTML server-side saves no work here
+    (and would need unsafe_allow_html on user-typed text).
     """
     
-    if role == "ai":
-        with st.chat_message("assistant", avatar="🤖"):
-            st.markdown(content)
-            if timestamp:
-                st.caption(f"🕐 {timestamp}")
-    else:
-        with st.chat_message("user", avatar="👤"):
-            st.markdown(content)
-            if timestamp:
-                st.caption(f"🕐 {timestamp}")
+    name, avatar = _ROLE_CFG.get(role, _ROLE_CFG["user"])
+    with st.chat_message(name, avatar=avatar):
+        st.markdown(content)
+        if timestamp:
+            st.caption(f"🕐 {timestamp}")
 
 
-def display_chat_history(chat_history: List[Dict[str, Any]]):
+@st.fragment
+def display_chat_history(chat_history: Iterable[Message], window: int = CHAT_WINDOW_STEP):
     """
-    Display entire chat history.
+    Display the most recent part of the chat history.
+    
+    Only the last `window` messages are rendered, so each rerun costs the same
+    however long the session gets. A "Load earlier messages" button widens the
+    window (tracked in st.session_state.chat_window) by CHAT_WINDOW_STEP.
+    
+    Runs as a fragment: the button only reruns the history, not the page.
     
     Args:
-        chat_history: List of message dicts with 'role', 'content', 'timestamp'
+        chat_history: Sized sequence (list or deque) of Message tuples
+        window: Minimum number of recent messages to render
     """
     
-    for msg in chat_history:
+    window = max(window, st.session_state.get("chat_window", window))
+    total = len(chat_history)
+    hidden = max(0, total - window)
+    
+    if hidden:
+        if st.button(f"⬆️ Load earlier messages ({hidden} hidden)", key="load_earlier_messages"):
+            st.session_state.chat_window = window + CHAT_WINDOW_STEP
+            st.rerun(scope="fragment")
+    
+    # islice rather than slicing, so deques work too
+    visible = list(islice(chat_history, hidden, total))
+    older, recent = visible[:-CHAT_BUBBLE_TAIL], visible[-CHAT_BUBBLE_TAIL:]
+    
+    # One element for the older part of the window instead of one bubble each
+    prev_ts = None
+    if older:
+        with st.container():
+            st.markdown(_render_bulk(older))
+        prev_ts = older[-1].timestamp
+    
+    # A timestamp repeated from the previous message adds nothing - skip it
+    for msg in recent:
+        ts = msg.timestamp
         display_chat_message(
-            role=msg.get("role", "user"),
-            content=msg.get("content", ""),
-            timestamp=msg.get("timestamp")
+            role=msg.role,
+            content=msg.content,
+            timestamp=ts if ts != prev_ts else None
         )
+        prev_ts = ts
+
+
+def _render_bulk(messages: List[Message]) -> str:
+    """
+    Render several chat messages as a single markdown string.
+    
+    Args:
+        messages: Message tuples
+        
+    Returns:
+        str: Markdown with a role/time header per message, separated by rules
+            (the time is left out when it repeats the previous message's)
+    """
+    parts = []
+    prev_ts = None
+    for msg in messages:
+        header = f"**{_ROLE_LABELS.get(msg.role, _ROLE_LABELS['user'])}**"
+        ts = msg.timestamp
+        if ts and ts != prev_ts:
+            header += f" ({ts})"
+        prev_ts = ts
+        parts.append(f"{header}\n\n{msg.content}\n\n---\n")
+    return "\n".join(parts)
 
 
-def display_progress_bar(current: int, total: int, label: str = "Progress"):
+def display_progress_bar(current: int, total: int, label: str = "Progress", placeholder=None):
     """
     Display a progress bar with label.
     
+    Pass the placeholder returned by a previous call to move the same bar
+    forward instead of adding a new one. Element handles only live for one
+    script run, so they are not kept in session_state across reruns.
+    
     Args:
         current: Current progress (1-based)
         total: Total items
         label: Label text
+        placeholder: Optional st.empty() slot from an earlier call this run
+    
+    Returns:
+        The placeholder holding the bar, for further in-place updates
     """
     
+    if placeholder is None:
+        placeholder = st.empty()
+    
     if total > 0:
-        progress_value = current / total
-        st.progress(progress_value, text=f"{label}: {current}/{total}")
+        placeholder.progress(current / total, text=f"{label}: {current}/{total}")
     else:
-        st.progress(0, text=f"{label}: 0/0")
+        placeholder.progress(0, text=f"{label}: 0/0")
+    
+    return placeholder
 
 
 def get_timestamp() -> str:
@@ -71,7 +159,12 @@ def get_timestamp() -> str:
     Returns:
         str: Timestamp like "10:30 AM"
     """
-    return datetime.now().strftime("%I:%M %p")
+    now = time.time()
+    second = int(now)
+    if second != _last_ts_cache["t"]:
+        _last_ts_cache["s"] = time.strftime("%I:%M %p", time.localtime(now))
+        _last_ts_cache["t"] = second
+    return _last_ts_cache["s"]
 
 
 def show_loading_message(message: str = "Processing..."):
@@ -87,6 +180,35 @@ def show_loading_message(message: str = "Processing..."):
     return st.spinner(message)
 
 
+# ───────────────────────────────────────────────────────────────────────────
+# Notifications - queued in session_state and shown as toasts by
+# flush_notifications() at the end of the script run. Queued messages survive
+# an st.rerun() and are shown on the next run instead of being wiped.
+# ───────────────────────────────────────────────────────────────────────────
+
+def _queue_notification(message: str, icon: str):
+    """Add a notification to this session's toast queue."""
+    st.session_state.setdefault("_notif_queue", []).append((message, icon))
+
+
+def flush_notifications():
+    """
+    Show all queued notifications as toasts, then clear the queue.
+    
+    Identical (message, icon) pairs queued in the same run are shown once.
+    Call at the end of the app script, and at the end of any fragment that
+    can queue notifications - fragment reruns never reach the app script's
+    call.
+    """
+    queue = st.session_state.get("_notif_queue")
+    if not queue:
+        return
+    
+    for message, icon in dict.fromkeys(queue):
+        st.toast(message, icon=icon)
+    queue.clear()
+
+
 def show_success_message(message: str, duration: int = 3):
     """
     Show a temporary success message.
@@ -95,7 +217,7 @@ def show_success_message(message: str, duration: int = 3):
         message: Success message
         duration: Duration in seconds (Streamlit default)
     """
-    st.success(message, icon="✅")
+    _queue_notification(message, "✅")
 
 
 def show_error_message(message: str):
@@ -105,7 +227,7 @@ def show_error_message(message: str):
     Args:
         message: Error message
     """
-    st.error(message, icon="❌")
+    _queue_notification(message, "❌")
 
 
 def show_info_message(message: str):
@@ -115,7 +237,7 @@ def show_info_message(message: str):
     Args:
         message: Info message
     """
-    st.info(message, icon="ℹ️")
+    _queue_notification(message, "ℹ️")
 
 
 def show_warning_message(message: str):
@@ -125,7 +247,7 @@ def show_warning_message(message: str):
     Args:
         message: Warning message
     """
-    st.warning(message, icon="⚠️")
+    _queue_notification(message, "⚠️")
 
 
 def create_metric_card(label: str, value: str, delta: str = None):
@@ -9,6 +9,7 @@ This script simulates a full learning session to verify:
 """
 
 import sys
+import time
 from pathlib import Path
 
 # Add backend to path
@@ -16,14 +17,31 @@ PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 sys.path.insert(0, str(PROJECT_ROOT / "backend"))
 
-from backend.graph import compile_graph
-from backend.state import TeachingState
+# The backend (LangGraph, LLM SDKs) is imported inside each test, so importing
+# or collecting this module stays cheap. compile_graph() returns a process-wide
+# singleton - the tests share the graph compiled by the first call (and its
+# checkpointer, which they rely on).
+
+# Format for interaction record timestamps (matches the backend's records)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Section separators for the printed report
+_HR = "=" * 80
+_HR_LIGHT = "─" * 80
+
+
+def _emit(*lines):
+    """Write several output lines with a single stdout write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
 
 def test_initial_flow():
     """Test the initial graph execution from start to first pause."""
-    print("=" * 80)
-    print("TEST 1: Initial Flow (Initialization)")
-    print("=" * 80)
+    _emit(
+        _HR,
+        "TEST 1: Initial Flow (Initialization)",
+        _HR
+    )
     
     # Create initial state
     initial_state = {
@@ -37,28 +55,33 @@ def test_initial_flow():
     }
     
     # Get compiled graph
+    from backend.graph import compile_graph
     compiled_graph = compile_graph()
     
     # Create config with thread_id
     thread_id = "test_session_001"
     config = {"configurable": {"thread_id": thread_id}}
     
-    print("\n🚀 Starting graph execution...")
-    print(f"Thread ID: {thread_id}\n")
+    _emit(
+        "\n🚀 Starting graph execution...",
+        f"Thread ID: {thread_id}\n"
+    )
     
     # Invoke graph
     result = compiled_graph.invoke(initial_state, config)
     
-    print("\n" + "=" * 80)
-    print("RESULT AFTER INITIAL EXECUTION:")
-    print("=" * 80)
-    print(f"next_action: {result.get('next_action')}")
-    print(f"current_concept_index: {result.get('current_concept_index')}")
-    print(f"current_takeaway_index: {result.get('current_takeaway_index')}")
-    print(f"total_concepts: {len(result.get('concepts', []))}")
-    print(f"total_takeaways: {len(result.get('takeaways', []))}")
-    print(f"interactions count: {len(result.get('interactions', []))}")
-    print(f"messages count: {len(result.get('messages', []))}")
+    _emit(
+        "\n" + _HR,
+        "RESULT AFTER INITIAL EXECUTION:",
+        _HR,
+        f"next_action: {result.get('next_action')}",
+        f"current_concept_index: {result.get('current_concept_index')}",
+        f"current_takeaway_index: {result.get('current_takeaway_index')}",
+        f"total_concepts: {len(result.get('concepts', []))}",
+        f"total_takeaways: {len(result.get('takeaways', []))}",
+        f"interactions count: {len(result.get('interactions', []))}",
+        f"messages count: {len(result.get('messages', []))}"
+    )
     
     # Check if we got to the expected pause point
     if result.get('next_action') == 'wait_for_response':
@@ -71,10 +94,13 @@ def test_initial_flow():
 
 def test_resume_flow(thread_id):
     """Test resuming from checkpoint with a student response."""
-    print("\n\n" + "=" * 80)
-    print("TEST 2: Resume Flow (Student Responds)")
-    print("=" * 80)
+    _emit(
+        "\n\n" + _HR,
+        "TEST 2: Resume Flow (Student Responds)",
+        _HR
+    )
     
+    from backend.graph import compile_graph
     compiled_graph = compile_graph()
     config = {"configurable": {"thread_id": thread_id}}
     
@@ -82,10 +108,12 @@ def test_resume_flow(thread_id):
     current_state = compiled_graph.get_state(config)
     current_values = current_state.values
     
-    print(f"\n📍 Current checkpoint state:")
-    print(f"   next_action: {current_values.get('next_action')}")
-    print(f"   current_takeaway_index: {current_values.get('current_takeaway_index')}")
-    print(f"   interactions count: {len(current_values.get('interactions', []))}")
+    _emit(
+        f"\n📍 Current checkpoint state:",
+        f"   next_action: {current_values.get('next_action')}",
+        f"   current_takeaway_index: {current_values.get('current_takeaway_index')}",
+        f"   interactions count: {len(current_values.get('interactions', []))}"
+    )
     
     # Simulate student response
     user_input = "Acids release hydrogen ions"
@@ -93,21 +121,20 @@ def test_resume_flow(thread_id):
     print(f"\n👤 Student Response: '{user_input}'")
     
     # Create interaction record
-    import datetime
     messages = current_values.get("messages", [])
     agent_message = messages[-1] if messages else "Question asked"
     
     new_interaction = {
-        "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": time.strftime(TIMESTAMP_FORMAT),
         "agent_message": agent_message,
         "student_response": user_input,
         "understanding_status": None
     }
     
-    interactions = list(current_values.get("interactions", []))
-    interactions.append(new_interaction)
+    # Only the new record is sent - the interactions reducer appends it
+    total_interactions = len(current_values.get("interactions", [])) + 1
     
-    print(f"✅ Created interaction record (total: {len(interactions)})")
+    print(f"✅ Created interaction record (total: {total_interactions})")
     
     # Update state
     print(f"🔄 Updating state with student_response, interactions, and next_action...")
@@ -115,7 +142,7 @@ def test_resume_flow(thread_id):
         config,
         {
             "student_response": user_input,
-            "interactions": interactions,
+            "interactions": [new_interaction],
             "next_action": "check_understanding"
         },
         as_node="probing"
@@ -125,14 +152,16 @@ def test_resume_flow(thread_id):
     print(f"▶️  Resuming graph execution...\n")
     result = compiled_graph.invoke(None, {**config, "recursion_limit": 25})
     
-    print("\n" + "=" * 80)
-    print("RESULT AFTER RESUME:")
-    print("=" * 80)
-    print(f"next_action: {result.get('next_action')}")
-    print(f"current_concept_index: {result.get('current_concept_index')}")
-    print(f"current_takeaway_index: {result.get('current_takeaway_index')}")
-    print(f"interactions count: {len(result.get('interactions', []))}")
-    print(f"messages count: {len(result.get('messages', []))}")
+    _emit(
+        "\n" + _HR,
+        "RESULT AFTER RESUME:",
+        _HR,
+        f"next_action: {result.get('next_action')}",
+        f"current_concept_index: {result.get('current_concept_index')}",
+        f"current_takeaway_index: {result.get('current_takeaway_index')}",
+        f"interactions count: {len(result.get('interactions', []))}",
+        f"messages count: {len(result.get('messages', []))}"
+    )
     
     # Check understanding status
     if result.get('interactions'):
@@ -156,12 +185,16 @@ def test_resume_flow(thread_id):
 
 def test_multiple_iterations(thread_id, num_iterations=3):
     """Test multiple student responses to verify continuous flow."""
-    print("\n\n" + "=" * 80)
-    print(f"TEST 3: Multiple Iterations ({num_iterations} responses)")
-    print("=" * 80)
+    _emit(
+        "\n\n" + _HR,
+        f"TEST 3: Multiple Iterations ({num_iterations} responses)",
+        _HR
+    )
     
+    from backend.graph import compile_graph
     compiled_graph = compile_graph()
     config = {"configurable": {"thread_id": thread_id}}
+    resume_config = {**config, "recursion_limit": 25}
     
     responses = [
         "Acids donate protons",
@@ -169,93 +202,111 @@ def test_multiple_iterations(thread_id, num_iterations=3):
         "Acids release hydrogen"
     ]
     
+    # The iterations run in order on one thread on purpose: each response
+    # answers the question the previous invoke() produced, so they can't be
+    # fanned out with compiled_graph.batch() over separate threads.
+    # Only the first question needs a checkpoint read - after that, each
+    # invoke() result already carries the next question
+    messages = compiled_graph.get_state(config).values.get("messages", [])
+    agent_message = messages[-1] if messages else "Question"
+    
     for i, user_input in enumerate(responses[:num_iterations], 1):
-        print(f"\n{'─' * 80}")
-        print(f"ITERATION {i}: Student responds with '{user_input}'")
-        print(f"{'─' * 80}")
-        
-        # Get current state
-        current_state = compiled_graph.get_state(config)
-        current_values = current_state.values
+        _emit(
+            "\n" + _HR_LIGHT,
+            f"ITERATION {i}: Student responds with '{user_input}'",
+            _HR_LIGHT
+        )
         
         # Create interaction
-        import datetime
-        messages = current_values.get("messages", [])
-        agent_message = messages[-1] if messages else "Question"
-        
         new_interaction = {
-            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": time.strftime(TIMESTAMP_FORMAT),
             "agent_message": agent_message,
             "student_response": user_input,
             "understanding_status": None
         }
         
-        interactions = list(current_values.get("interactions", []))
-        interactions.append(new_interaction)
-        
-        # Update and resume
+        # Update and resume (the interactions reducer appends the new record)
         compiled_graph.update_state(
             config,
             {
                 "student_response": user_input,
-                "interactions": interactions,
+                "interactions": [new_interaction],
                 "next_action": "check_understanding"
             },
             as_node="probing"
         )
         
-        result = compiled_graph.invoke(None, {**config, "recursion_limit": 25})
+        result = compiled_graph.invoke(None, resume_config)
+        messages = result.get("messages", [])
+        agent_message = messages[-1] if messages else "Question"
         
-        print(f"   ✓ Current concept: {result.get('current_concept_index')}")
-        print(f"   ✓ Current takeaway: {result.get('current_takeaway_index')}")
-        print(f"   ✓ Next action: {result.get('next_action')}")
+        # Collect this iteration's summary and write it in one go
+        buf = [
+            f"   ✓ Current concept: {result.get('current_concept_index')}",
+            f"   ✓ Current takeaway: {result.get('current_takeaway_index')}",
+            f"   ✓ Next action: {result.get('next_action')}"
+        ]
         
         if result.get('interactions'):
             last_interaction = result['interactions'][-1]
             understanding = last_interaction.get('understanding_status', {})
-            print(f"   ✓ Understanding: {understanding.get('classification', 'unknown')}")
+            buf.append(f"   ✓ Understanding: {understanding.get('classification', 'unknown')}")
+        
+        _emit(*buf)
     
-    print("\n" + "=" * 80)
-    print("✅ Multiple iterations completed successfully!")
-    print("=" * 80)
+    _emit(
+        "\n" + _HR,
+        "✅ Multiple iterations completed successfully!",
+        _HR
+    )
 
 
 def verify_node_execution_order():
     """Verify the nodes are being called in the correct order."""
-    print("\n\n" + "=" * 80)
-    print("TEST 4: Node Execution Order Verification")
-    print("=" * 80)
-    
-    print("\n📋 Expected Initial Flow:")
-    print("   1. ingest → 2. parse → 3. extract_concepts → 4. router")
-    print("   5. planner → 6. teaching → 7. probing → [PAUSE]")
-    
-    print("\n📋 Expected Resume Flow (after student response):")
-    print("   7. probing → 8. understanding_checker → 9. feedback")
-    print("   → 6. teaching (or 7. probing or 4. router)")
-    print("   → 7. probing → [PAUSE]")
-    
-    print("\n📋 Teaching Loop Variations:")
-    print("   - Understood: feedback → teaching (next takeaway) → probing")
-    print("   - Partial: feedback → probing (same question)")
-    print("   - Confused: feedback → teaching (re-explain) → probing")
-    print("   - All takeaways done: feedback → router → planner (next concept)")
-    print("   - All concepts done: router → mcq_generator → assessment → summary → END")
+    _emit(
+        "\n\n" + _HR,
+        "TEST 4: Node Execution Order Verification",
+        _HR
+    )
+    
+    _emit(
+        "\n📋 Expected Initial Flow:",
+        "   1. ingest → 2. parse → 3. extract_concepts → 4. router",
+        "   5. planner → 6. teaching → 7. probing → [PAUSE]"
+    )
+    
+    _emit(
+        "\n📋 Expected Resume Flow (after student response):",
+        "   7. probing → 8. understanding_checker → 9. feedback",
+        "   → 6. teaching (or 7. probing or 4. router)",
+        "   → 7. probing → [PAUSE]"
+    )
+    
+    _emit(
+        "\n📋 Teaching Loop Variations:",
+        "   - Understood: feedback → teaching (next takeaway) → probing",
+        "   - Partial: feedback → probing (same question)",
+        "   - Confused: feedback → teaching (re-explain) → probing",
+        "   - All takeaways done: feedback → router → planner (next concept)",
+        "   - All concepts done: router → mcq_generator → assessment → summary → END"
+    )
     
     print("\n✅ Node execution order is correctly defined in graph.py")
 
 
 if __name__ == "__main__":
-    print("\n" + "=" * 80)
-    print("BACKEND NODE FLOW & CHECKPOINTING TEST")
-    print("=" * 80)
-    print("\nThis script verifies:")
-    print("1. ✓ Initial flow executes all nodes correctly")
-    print("2. ✓ Graph pauses at probing node when waiting for response")
-    print("3. ✓ Graph resumes from checkpoint with student response")
-    print("4. ✓ Teaching loop executes: understanding_checker → feedback → teaching/probing")
-    print("5. ✓ Multiple iterations work correctly")
-    print("6. ✓ Node execution order is preserved")
+    _emit(
+        "\n" + _HR,
+        "BACKEND NODE FLOW & CHECKPOINTING TEST",
+        _HR,
+        "\nThis script verifies:",
+        "1. ✓ Initial flow executes all nodes correctly",
+        "2. ✓ Graph pauses at probing node when waiting for response",
+        "3. ✓ Graph resumes from checkpoint with student response",
+        "4. ✓ Teaching loop executes: understanding_checker → feedback → teaching/probing",
+        "5. ✓ Multiple iterations work correctly",
+        "6. ✓ Node execution order is preserved"
+    )
     
     try:
         # Test 1: Initial flow
@@ -271,18 +322,22 @@ if __name__ == "__main__":
         # Test 4: Verify node order
         verify_node_execution_order()
         
-        print("\n\n" + "=" * 80)
-        print("🎉 ALL TESTS PASSED!")
-        print("=" * 80)
-        print("\n✅ Backend node flow is correct")
-        print("✅ Checkpointing is working properly")
-        print("✅ Teaching loop executes serially")
-        print("✅ Graph resumes from correct checkpoint")
+        _emit(
+            "\n\n" + _HR,
+            "🎉 ALL TESTS PASSED!",
+            _HR,
+            "\n✅ Backend node flow is correct",
+            "✅ Checkpointing is working properly",
+            "✅ Teaching loop executes serially",
+            "✅ Graph resumes from correct checkpoint"
+        )
         
     except Exception as e:
-        print("\n\n" + "=" * 80)
-        print("❌ TEST FAILED!")
-        print("=" * 80)
-        print(f"Error: {str(e)}")
+        _emit(
+            "\n\n" + _HR,
+            "❌ TEST FAILED!",
+            _HR,
+            f"Error: {str(e)}"
+        )
         import traceback
         traceback.print_exc()
@@ -12,70 +12,98 @@ sys.path.insert(0, str(PROJECT_ROOT / "backend"))
 
 from backend.graph import compile_graph, create_teaching_graph
 
-print("=" * 80)
-print("BACKEND NODE FLOW VERIFICATION")
-print("=" * 80)
+# Section separator for the printed report
+_HR = "=" * 80
+
+
+def _emit(*lines):
+    """Write several output lines with a single stdout write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+_emit(
+    _HR,
+    "BACKEND NODE FLOW VERIFICATION",
+    _HR
+)
 
 # Create the graph
 workflow = create_teaching_graph()
 
-print("\n✅ Graph created successfully!")
-print(f"\n📊 Total nodes: {len(workflow.nodes)}")
-print("\n📋 All nodes:")
-for node_name in workflow.nodes.keys():
-    print(f"   • {node_name}")
-
-print("\n" + "=" * 80)
-print("EXPECTED FLOW PATHS")
-print("=" * 80)
-
-print("\n🚀 INITIAL FLOW (First execution):")
-print("   1. START → ingest")
-print("   2. ingest → parse")
-print("   3. parse → extract_concepts")
-print("   4. extract_concepts → router")
-print("   5. router → planner (when next_action='plan')")
-print("   6. planner → teaching")
-print("   7. teaching → probing (when next_action='probe')")
-print("   8. probing → END (when next_action='wait_for_response')")
-print("   ⏸️  [GRAPH PAUSES HERE - Waiting for student response]")
-
-print("\n🔄 RESUME FLOW (After student responds):")
-print("   1. Update state: student_response + next_action='check_understanding'")
-print("   2. probing → understanding_checker (routes via conditional edge)")
-print("   3. understanding_checker → feedback")
-print("   4. feedback → [CONDITIONAL ROUTING]:")
-print("      a) teaching (if understood → next takeaway)")
-print("      b) teaching (if confused → re-explain same takeaway)")
-print("      c) probing (if partial → re-ask with hint)")
-print("      d) router (if all takeaways complete → next concept)")
-print("   5. teaching → probing")
-print("   6. probing → END (wait_for_response)")
-print("   ⏸️  [GRAPH PAUSES AGAIN]")
-
-print("\n🔁 TEACHING LOOP CYCLES:")
-print("   • teaching → probing → understanding_checker → feedback →")
-print("     ├─ understood → teaching (next takeaway) → probing → ...")
-print("     ├─ partial → probing (same question) → ...")
-print("     └─ confused → teaching (re-explain) → probing → ...")
-
-print("\n🎯 CONCEPT PROGRESSION:")
-print("   When all takeaways in concept complete:")
-print("   feedback → router → planner (new concept) → teaching → ...")
-
-print("\n📝 ASSESSMENT PHASE:")
-print("   When all concepts complete:")
-print("   router → mcq_generator → assessment → summary → END")
-
-print("\n" + "=" * 80)
-print("CHECKPOINTING VERIFICATION")
-print("=" * 80)
-
-# Compile the graph
-compiled_graph = compile_graph()
-
-print("\n✅ Graph compiled with checkpointing!")
-print(f"   Type: {type(compiled_graph)}")
+_emit(
+    "\n✅ Graph created successfully!",
+    f"\n📊 Total nodes: {len(workflow.nodes)}",
+    "\n📋 All nodes:",
+    *(f"   • {node_name}" for node_name in workflow.nodes.keys())
+)
+
+_emit(
+    "\n" + _HR,
+    "EXPECTED FLOW PATHS",
+    _HR
+)
+
+_emit(
+    "\n🚀 INITIAL FLOW (First execution):",
+    "   1. START → ingest",
+    "   2. ingest → parse",
+    "   3. parse → extract_concepts",
+    "   4. extract_concepts → router",
+    "   5. router → planner (when next_action='plan')",
+    "   6. planner → teaching",
+    "   7. teaching → probing (when next_action='probe')",
+    "   8. probing → END (when next_action='wait_for_response')",
+    "   ⏸️  [GRAPH PAUSES HERE - Waiting for student response]"
+)
+
+_emit(
+    "\n🔄 RESUME FLOW (After student responds):",
+    "   1. Update state: student_response + next_action='check_understanding'",
+    "   2. probing → understanding_checker (routes via conditional edge)",
+    "   3. understanding_checker → feedback",
+    "   4. feedback → [CONDITIONAL ROUTING]:",
+    "      a) teaching (if understood → next takeaway)",
+    "      b) teaching (if confused → re-explain same takeaway)",
+    "      c) probing (if partial → re-ask with hint)",
+    "      d) router (if all takeaways complete → next concept)",
+    "   5. teaching → probing",
+    "   6. probing → END (wait_for_response)",
+    "   ⏸️  [GRAPH PAUSES AGAIN]"
+)
+
+_emit(
+    "\n🔁 TEACHING LOOP CYCLES:",
+    "   • teaching → probing → understanding_checker → feedback →",
+    "     ├─ understood → teaching (next takeaway) → probing → ...",
+    "     ├─ partial → probing (same question) → ...",
+    "     └─ confused → teaching (re-explain) → probing → ..."
+)
+
+_emit(
+    "\n🎯 CONCEPT PROGRESSION:",
+    "   When all takeaways in concept complete:",
+    "   feedback → router → planner (new concept) → teaching → ..."
+)
+
+_emit(
+    "\n📝 ASSESSMENT PHASE:",
+    "   When all concepts complete:",
+    "   router → mcq_generator → assessment → summary → END"
+)
+
+_emit(
+    "\n" + _HR,
+    "CHECKPOINTING VERIFICATION",
+    _HR
+)
+
+# Compile the graph (reusing the workflow built above instead of building it again)
+compiled_graph = compile_graph(workflow=workflow)
+
+_emit(
+    "\n✅ Graph compiled with checkpointing!",
+    f"   Type: {type(compiled_graph)}"
+)
 
 # Check if checkpointer is attached
 if hasattr(compiled_graph, 'checkpointer'):
@@ -83,42 +111,54 @@ if hasattr(compiled_graph, 'checkpointer'):
 else:
     print("   ⚠️  No checkpointer attribute found")
 
-print("\n📍 How checkpointing works:")
-print("   1. Each session has unique thread_id (e.g., 'session_abc123')")
-print("   2. State saved after EVERY node execution")
-print("   3. When graph hits END (wait_for_response), state is saved")
-print("   4. To resume: update state + change next_action + invoke()")
-print("   5. Graph resumes from checkpoint, executes remaining nodes")
-
-print("\n" + "=" * 80)
-print("CRITICAL FIX EXPLANATION")
-print("=" * 80)
-
-print("\n❌ PROBLEM (Before fix):")
-print("   • Graph hit END with next_action='wait_for_response'")
-print("   • We updated student_response in state")
-print("   • But next_action stayed 'wait_for_response'")
-print("   • invoke(None) had nowhere to go from END")
-print("   • Graph returned immediately without executing nodes")
-
-print("\n✅ SOLUTION (After fix):")
-print("   • Update THREE things in state:")
-print("     1. student_response: User's answer")
-print("     2. interactions: Add new interaction record")
-print("     3. next_action: Change to 'check_understanding'")
-print("   • Now conditional edge routes to understanding_checker")
-print("   • Graph executes full teaching loop")
-print("   • Pauses again at probing node")
-
-print("\n" + "=" * 80)
-print("✅ VERIFICATION COMPLETE")
-print("=" * 80)
-
-print("\n✅ All nodes are defined correctly")
-print("✅ Edges connect nodes in proper sequence")
-print("✅ Conditional edges handle routing logic")
-print("✅ Checkpointing is properly configured")
-print("✅ Resume mechanism updates state correctly")
-print("✅ Teaching loop executes serially")
+_emit(
+    "\n📍 How checkpointing works:",
+    "   1. Each session has unique thread_id (e.g., 'session_abc123')",
+    "   2. State saved after EVERY node execution",
+    "   3. When graph hits END (wait_for_response), state is saved",
+    "   4. To resume: update state + change next_action + invoke()",
+    "   5. Graph resumes from checkpoint, executes remaining nodes"
+)
+
+_emit(
+    "\n" + _HR,
+    "CRITICAL FIX EXPLANATION",
+    _HR
+)
+
+_emit(
+    "\n❌ PROBLEM (Before fix):",
+    "   • Graph hit END with next_action='wait_for_response'",
+    "   • We updated student_response in state",
+    "   • But next_action stayed 'wait_for_response'",
+    "   • invoke(None) had nowhere to go from END",
+    "   • Graph returned immediately without executing nodes"
+)
+
+_emit(
+    "\n✅ SOLUTION (After fix):",
+    "   • Update THREE things in state:",
+    "     1. student_response: User's answer",
+    "     2. interactions: Send only the new record (state reducer appends it)",
+    "     3. next_action: Change to 'check_understanding'",
+    "   • Now conditional edge routes to understanding_checker",
+    "   • Graph executes full teaching loop",
+    "   • Pauses again at probing node"
+)
+
+_emit(
+    "\n" + _HR,
+    "✅ VERIFICATION COMPLETE",
+    _HR
+)
+
+_emit(
+    "\n✅ All nodes are defined correctly",
+    "✅ Edges connect nodes in proper sequence",
+    "✅ Conditional edges handle routing logic",
+    "✅ Checkpointing is properly configured",
+    "✅ Resume mechanism updates state correctly",
+    "✅ Teaching loop executes serially"
+)
 
 print("\n🎉 Backend node flow is CORRECT and follows serial execution!")